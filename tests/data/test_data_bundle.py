@@ -0,0 +1,133 @@
+import datetime
+import unittest
+from unittest import mock
+
+import polars as pl
+from exchange_calendars import get_calendar
+
+from ziplime.assets.entities.equity import Equity
+from ziplime.constants.data_type import DataType
+from ziplime.data.domain import data_bundle as data_bundle_module
+from ziplime.data.domain.data_bundle import DataBundle
+
+
+def make_data_bundle(sids: list[int], days: int) -> DataBundle:
+    start_date = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    dates = [start_date + datetime.timedelta(days=day) for day in range(days)]
+    data = pl.DataFrame({
+        "sid": [sid for sid in sids for _ in dates],
+        "date": dates * len(sids),
+        "close": [float(day) for _ in sids for day in range(days)],
+    })
+    return DataBundle(name="test", version="1", start_date=dates[0], end_date=dates[-1],
+                      trading_calendar=get_calendar("XNYS"), frequency=datetime.timedelta(days=1),
+                      original_frequency=datetime.timedelta(days=1), data_type=DataType.MARKET_DATA,
+                      timestamp=start_date, data=data)
+
+
+def make_equity(sid: int) -> Equity:
+    return Equity(sid=sid, asset_name=f"ASSET{sid}", start_date=datetime.date(2020, 1, 1),
+                  end_date=datetime.date(2030, 1, 1), first_traded=None, auto_close_date=None, mic=None,
+                  symbol_mapping={})
+
+
+class DataBundleQueryCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data_bundle = make_data_bundle(sids=[1, 2], days=10)
+        self.start_date = self.data_bundle.start_date
+        self.end_date = self.data_bundle.end_date
+
+    def query(self, sids=frozenset({1, 2}), end_date=None):
+        return self.data_bundle.get_data_by_date_and_sids(fields=frozenset({"close"}), start_date=self.start_date,
+                                                          end_date=end_date or self.end_date,
+                                                          frequency=datetime.timedelta(days=1), sids=sids,
+                                                          include_bounds=True)
+
+    def test_repeated_query_hits_cache(self):
+        first = self.query()
+        second = self.query()
+        self.assertEqual((self.data_bundle.query_cache_hits, self.data_bundle.query_cache_misses), (1, 1))
+        self.assertTrue(first.equals(second))
+
+    def test_returned_frame_changes_do_not_leak_into_cache(self):
+        first = self.query()
+        first.insert_column(0, pl.Series("extra", range(first.height)))
+        self.assertNotIn("extra", self.query().columns)
+
+    def test_cache_is_bounded_by_rows(self):
+        with mock.patch.object(data_bundle_module, "QUERY_CACHE_MAX_ROWS", 15):
+            self.query(sids=frozenset({1}))
+            self.query(sids=frozenset({2}))
+            # 20 rows over the budget, the oldest result is evicted
+            self.query(sids=frozenset({1}))
+            self.assertEqual(self.data_bundle.query_cache_misses, 3)
+            # result larger than the whole budget is never cached
+            self.query()
+            self.query()
+            self.assertEqual((self.data_bundle.query_cache_hits, self.data_bundle.query_cache_misses), (0, 5))
+
+    def test_cache_is_bounded_by_entry_count(self):
+        with mock.patch.object(data_bundle_module, "QUERY_CACHE_SIZE", 2):
+            for day in range(1, 4):
+                self.query(end_date=self.start_date + datetime.timedelta(days=day))
+            self.query(end_date=self.start_date + datetime.timedelta(days=1))
+            self.assertEqual((self.data_bundle.query_cache_hits, self.data_bundle.query_cache_misses), (0, 4))
+            self.query(end_date=self.start_date + datetime.timedelta(days=3))
+            self.assertEqual(self.data_bundle.query_cache_hits, 1)
+
+
+class DataBundleWithoutSidIndexesTestCase(unittest.TestCase):
+
+    def test_query_filters_whole_frame(self):
+        data_bundle = make_data_bundle(sids=[1, 2], days=10)
+        expected = data_bundle.get_data_by_date_and_sids(fields=frozenset({"close"}),
+                                                         start_date=data_bundle.start_date,
+                                                         end_date=data_bundle.end_date,
+                                                         frequency=datetime.timedelta(days=1), sids=frozenset({2}),
+                                                         include_bounds=True)
+        data_bundle.sid_indexes = None
+        data_bundle._query_cache.clear()
+        result = data_bundle.get_data_by_date_and_sids(fields=frozenset({"close"}),
+                                                       start_date=data_bundle.start_date,
+                                                       end_date=data_bundle.end_date,
+                                                       frequency=datetime.timedelta(days=1), sids=frozenset({2}),
+                                                       include_bounds=True)
+        self.assertEqual(result.height, 10)
+        self.assertTrue(result.equals(expected))
+
+
+class DataBundleDataTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data_bundle = make_data_bundle(sids=[1, 2], days=10)
+
+    def spot_close(self, dt):
+        return self.data_bundle.get_spot_value(assets=frozenset({make_equity(1), make_equity(2)}),
+                                               fields=frozenset({"close"}), dt=dt,
+                                               frequency=datetime.timedelta(days=1))["close"].to_list()
+
+    def test_sid_indexes_are_built_from_data(self):
+        self.assertEqual(self.data_bundle.sid_indexes, {1: (0, 10), 2: (10, 20)})
+
+    def test_replacing_data_resets_derived_state(self):
+        self.data_bundle.get_data_by_date_and_sids(fields=frozenset({"close"}),
+                                                   start_date=self.data_bundle.start_date,
+                                                   end_date=self.data_bundle.end_date,
+                                                   frequency=datetime.timedelta(days=1), sids=frozenset({1}),
+                                                   include_bounds=True)
+        self.spot_close(self.data_bundle.end_date)
+        self.data_bundle.data = make_data_bundle(sids=[2], days=5).data
+        self.assertEqual(self.data_bundle.sid_indexes, {2: (0, 5)})
+        self.assertIsNone(self.data_bundle._date_index)
+        self.assertEqual(len(self.data_bundle._query_cache), 0)
+        self.assertEqual(self.spot_close(self.data_bundle.end_date), [4.0])
+
+    def test_unsorted_data_falls_back_to_filters(self):
+        self.data_bundle.data = self.data_bundle.data.reverse()
+        self.assertIsNone(self.data_bundle.sid_indexes)
+        self.assertEqual(self.spot_close(self.data_bundle.start_date + datetime.timedelta(days=3)), [3.0, 3.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
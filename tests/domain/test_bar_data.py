@@ -0,0 +1,91 @@
+import datetime
+import unittest
+
+import pandas as pd
+import polars as pl
+from exchange_calendars import get_calendar
+
+from ziplime.assets.domain.continuous_future import ContinuousFuture
+from ziplime.assets.entities.equity import Equity
+from ziplime.assets.models.exchange_info import ExchangeInfo
+from ziplime.domain.bar_data import BarData
+from ziplime.finance.asset_restrictions import NoRestrictions, StaticRestrictions
+
+
+class SpotPriceDataSource:
+    """Data source returning a fixed last price per sid."""
+
+    name = "test"
+    frequency = datetime.timedelta(days=1)
+
+    def __init__(self, prices: dict[int, float]):
+        self.prices = prices
+
+    def get_spot_value(self, assets, fields, dt, frequency):
+        sids = [asset.sid for asset in assets if asset.sid in self.prices]
+        return pl.DataFrame({
+            "sid": sids,
+            "date": [dt] * len(sids),
+            "price": [self.prices[sid] for sid in sids],
+        })
+
+
+def make_equity(sid: int, mic: str | None, end_date: datetime.date = datetime.date(2030, 1, 1)) -> Equity:
+    return Equity(sid=sid, asset_name=f"ASSET{sid}", start_date=datetime.date(2020, 1, 1), end_date=end_date,
+                  first_traded=None, auto_close_date=None, mic=mic, symbol_mapping={})
+
+
+class BarDataCanTradeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.trading_calendar = get_calendar("XNYS")
+        self.dt = pd.Timestamp("2024-03-05 15:00", tz="UTC")
+
+    def can_trade(self, assets, prices, restrictions=None):
+        bar_data = BarData(data_sources={"test": SpotPriceDataSource(prices=prices)},
+                           simulation_dt_func=lambda: self.dt,
+                           trading_calendar=self.trading_calendar,
+                           restrictions=restrictions or NoRestrictions())
+        return bar_data.can_trade(assets=assets)
+
+    def test_unknown_mic_uses_simulation_calendar(self):
+        # assets ingested from LimexHub have a MIC that exchange_calendars doesn't know
+        lime_asset = make_equity(sid=1, mic="LIME")
+        result = self.can_trade(assets=[lime_asset], prices={1: 10.0})
+        self.assertTrue(result[lime_asset])
+
+    def test_known_mic_uses_exchange_calendar(self):
+        lse_asset = make_equity(sid=1, mic="XLON")
+        self.dt = pd.Timestamp("2024-03-05 20:00", tz="UTC")
+        result = self.can_trade(assets=[lse_asset], prices={1: 10.0})
+        self.assertFalse(result[lse_asset])
+
+    def test_checks_are_combined_per_asset(self):
+        tradeable = make_equity(sid=1, mic="LIME")
+        dead = make_equity(sid=2, mic="LIME", end_date=datetime.date(2021, 1, 1))
+        no_price = make_equity(sid=3, mic=None)
+        nan_price = make_equity(sid=4, mic="XNYS")
+        restricted = make_equity(sid=5, mic="LIME")
+        result = self.can_trade(assets=[tradeable, dead, no_price, nan_price, restricted],
+                                prices={1: 10.0, 2: 10.0, 4: float("nan"), 5: 10.0},
+                                restrictions=StaticRestrictions([restricted]))
+        self.assertEqual(result.to_dict(), {tradeable: True, dead: False, no_price: False, nan_price: False,
+                                            restricted: False})
+
+    def test_continuous_future_uses_its_own_alive_check(self):
+        exchange_info = ExchangeInfo(exchange="CMES", canonical_name="CMES", country_code="US")
+        alive = ContinuousFuture(sid=1, root_symbol="ES", offset=0, roll_style="calendar",
+                                 start_date=pd.Timestamp("2020-01-01"), end_date=pd.Timestamp("2030-01-01"),
+                                 exchange_info=exchange_info)
+        expired = ContinuousFuture(sid=2, root_symbol="NQ", offset=0, roll_style="calendar",
+                                   start_date=pd.Timestamp("2020-01-01"), end_date=pd.Timestamp("2021-01-01"),
+                                   exchange_info=exchange_info)
+        result = self.can_trade(assets=[alive, expired], prices={1: 10.0, 2: 10.0})
+        self.assertEqual(result.to_dict(), {alive: True, expired: False})
+
+    def test_no_assets(self):
+        self.assertTrue(self.can_trade(assets=[], prices={}).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ from ziplime.assets.domain.ordered_contracts import CHAIN_PREDICATES
 from ziplime.assets.repositories.sqlalchemy_adjustments_repository import SqlAlchemyAdjustmentRepository
 from ziplime.assets.repositories.sqlalchemy_asset_repository import SqlAlchemyAssetRepository
 from ziplime.constants.fundamental_data import FUNDAMENTAL_DATA_COLUMNS
+from ziplime.core.db.engine import async_engines_scope
 from ziplime.data.services.bundle_service import BundleService
 from ziplime.data.services.file_system_bundle_registry import FileSystemBundleRegistry
 from ziplime.data.services.limex_hub_data_source import LimexHubDataSource
@@ -56,6 +57,8 @@ async def main(ctx):
         level=logging.INFO,
         datefmt="%Y-%m-%dT%H:%M:%S%z",
     )
+    # database engines are bound to the event loop running the command, close them before it ends
+    await ctx.with_async_resource(async_engines_scope())
 
 
 @main.command(context_settings=dict(
@@ -1,7 +1,6 @@
 import datetime
 import sqlite3
 from collections import namedtuple
-from functools import lru_cache
 from itertools import chain
 from typing import Self, Any
 import polars as pl
@@ -10,12 +9,13 @@ import pandas as pd
 import structlog
 from numpy import integer as any_integer
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from ziplime.assets.entities.asset import Asset
 from ziplime.assets.models.dividend import Dividend
 from ziplime.assets.models.merger import Merger
 from ziplime.assets.models.split import Split
+from ziplime.core.db.engine import get_async_session_maker
 from ziplime.lib.adjustment import Float64Multiply
 from ziplime.utils.functional import keysorted
 from ziplime.utils.numpy_utils import (
@@ -148,12 +148,8 @@ class SqlAlchemyAdjustmentRepository(AdjustmentRepository):
         return self
 
     @property
-    @lru_cache
     def session_maker(self) -> async_sessionmaker[AsyncSession]:
-        engine = create_async_engine(self.db_url, pool_pre_ping=True, pool_size=20)
-        session_maker = async_sessionmaker(autocommit=False, autoflush=True, bind=engine, class_=AsyncSession,
-                                           expire_on_commit=False)
-        return session_maker
+        return get_async_session_maker(self.db_url)
 
     async def _get_sids_from_table(db,
                              tablename: str,
@@ -961,24 +957,22 @@ class SqlAlchemyAdjustmentRepository(AdjustmentRepository):
         splits : list[(asset, float)]
             List of splits, where each split is a (asset, ratio) tuple.
         """
+        # split processing is disabled, bundle prices may already be split adjusted and applying splits to
+        # positions as well would adjust them twice
         return []
         if not assets:
             return []
 
-        # convert dt to # of seconds since epoch, because that's what we use
-        # in the adjustments db
-        # seconds = int(dt.value / 1e9)
+        if isinstance(dt, datetime.datetime):
+            dt = dt.date()
 
-        splits = self.adjustment_repository.conn.execute(
-            "SELECT sid, ratio FROM SPLITS WHERE effective_date = ?", (dt,)
-        ).fetchall()
-
-        splits = [split for split in splits if split[0] in assets]
-        splits = [
-            (self.asset_repository.retrieve_asset(split[0]), split[1]) for split in splits
-        ]
+        # filter by sid in the database, so only splits of the requested assets are fetched
+        assets_by_sid = {asset.sid: asset for asset in assets}
+        q = select(Split.sid, Split.ratio).where(Split.effective_date == dt, Split.sid.in_(assets_by_sid))
+        async with self.session_maker() as session:
+            splits = (await session.execute(q)).all()
 
-        return splits
+        return [(assets_by_sid[sid], ratio) for sid, ratio in splits]
 
     def to_json(self):
         return {
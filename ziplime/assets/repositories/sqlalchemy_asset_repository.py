@@ -1,9 +1,9 @@
 import datetime
 from collections import deque
-from functools import partial, lru_cache
+from functools import partial
 from operator import attrgetter
 from pathlib import Path
-from typing import Any, Self
+from typing import Any, Callable, Self
 import pathlib
 
 import aiocache
@@ -11,7 +11,7 @@ import pandas as pd
 import sqlalchemy as sa
 from aiocache import cached, Cache
 from alembic import config, command
-from sqlalchemy import Table, select
+from sqlalchemy import Table, insert, select
 from sqlalchemy.orm import selectinload
 from toolz import (
     concat,
@@ -36,6 +36,7 @@ from ziplime.assets.models.symbols_universe import SymbolsUniverseModel
 from ziplime.assets.models.symbols_universe_asset import SymbolsUniverseAssetModel
 from ziplime.trading.models.trading_pair import TradingPair
 from ziplime.core.db.base_model import BaseModel
+from ziplime.core.db.engine import get_async_session_maker
 from ziplime.errors import (
     EquitiesNotFound,
     FutureContractsNotFound,
@@ -51,7 +52,7 @@ from ziplime.utils.sqlite_utils import group_into_chunks, SQLITE_MAX_VARIABLE_NU
 from ziplime.assets.models.exchange_info import ExchangeInfo
 
 import numpy as np
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from ziplime.assets.models.asset_model import AssetModel
 from ziplime.assets.domain.continuous_future import ContinuousFuture
@@ -103,12 +104,8 @@ class SqlAlchemyAssetRepository(AssetRepository):
         self.migrate()
 
     @property
-    @lru_cache
     def session_maker(self) -> async_sessionmaker[AsyncSession]:
-        engine = create_async_engine(self.db_url, pool_pre_ping=True, pool_size=20)
-        session_maker = async_sessionmaker(autocommit=False, autoflush=True, bind=engine, class_=AsyncSession,
-                                           expire_on_commit=False)
-        return session_maker
+        return get_async_session_maker(self.db_url)
 
     async def add_all_and_commit(self, models: list[BaseModel]):
         async with self.session_maker() as session:
@@ -121,62 +118,25 @@ class SqlAlchemyAssetRepository(AssetRepository):
     async def save_asset_routers(self, asset_routers: list[AssetRouter]) -> None:
         await self.add_all_and_commit(asset_routers)
 
-    async def save_currencies(self, currencies: list[Currency]) -> None:
-        assets_db = []
-        asset_routers = []
-        symbol_mappings = []
-        async with self.session_maker() as session:
+    async def _get_exchanges_by_names(self, exchange_names: set[str]) -> dict[str, ExchangeInfo]:
+        exchanges = {}
+        for exchange_name in exchange_names:
+            exchange = await self.get_exchange_by_name(exchange_name=exchange_name)
+            if exchange is None:
+                raise ValueError(f"Exchange {exchange_name} not found. Please register it.")
+            exchanges[exchange_name] = exchange
+        return exchanges
 
-            for currency in currencies:
-                asset_router = AssetRouter(
-                    sid=currency.sid,
-                    asset_type=AssetType.CURRENCY.value
-                )
-                asset_routers.append(asset_router)
-                session.add(asset_router)
-                await session.commit()
-                asset_db = CurrencyModel(
-                    sid=asset_router.sid,
-                    start_date=currency.start_date,
-                    first_traded=currency.first_traded,
-                    end_date=currency.end_date,
-                    asset_name=currency.asset_name,
-                    auto_close_date=currency.auto_close_date,
-                    mic=currency.mic
-                )
-                session.add(asset_db)
-                await session.commit()
-
-                assets_db.append(asset_db)
-                for symbol_mapping in currency.symbol_mapping.values():
-                    exchange = await self.get_exchange_by_name(exchange_name=symbol_mapping.exchange_name)
-                    if exchange is None:
-                        raise ValueError(f"Exchange {symbol_mapping.exchange_name} not found. Please register it.")
-                    symbol_mapping_model = CurrencySymbolMappingModel(
-                        sid=asset_db.sid,
-                        symbol=symbol_mapping.symbol,
-                        start_date=symbol_mapping.start_date,
-                        end_date=symbol_mapping.end_date,
-                        exchange=exchange.exchange,
-                    )
-                    symbol_mappings.append(symbol_mapping_model)
-                    session.add(symbol_mapping_model)
-                    await session.commit()
-
-            # trading_pair = TradingPair(
-            #     id=uuid.uuid4(),
-            #     base_asset_sid=asset_router.sid,
-            #     quote_asset_sid=asset_db.sid,
-            #     exchange=asset["exchange"],
-            # )
-            # trading_pairs.append(trading_pair)
-
-        # do this in one transaction
-        #     session.add_all(asset_routers)
-        #     await session.commit()
-        #     session.add_all(assets_db)
-        #     session.add_all(symbol_mappings)
-        #     await session.commit()
+    async def save_currencies(self, currencies: list[Currency]) -> None:
+        await self._save_assets(
+            assets=currencies, asset_type=AssetType.CURRENCY, asset_model=CurrencyModel,
+            symbol_mapping_model=CurrencySymbolMappingModel,
+            get_symbol_mapping_values=lambda symbol_mapping: {
+                "symbol": symbol_mapping.symbol,
+                "start_date": symbol_mapping.start_date,
+                "end_date": symbol_mapping.end_date,
+            }
+        )
 
     async def save_symbol_universe(self, symbol_universe: SymbolsUniverse):
         async with self.session_maker() as session:
@@ -209,57 +169,63 @@ class SqlAlchemyAssetRepository(AssetRepository):
             return exchanges
 
     async def save_equities(self, equities: list[Equity]) -> None:
-        assets_db = []
-        asset_routers = []
-        symbol_mappings = []
-        for equity in equities:
-            asset_router = AssetRouter(
-                sid=equity.sid,
-                asset_type=AssetType.EQUITY.value
-            )
-            asset_routers.append(asset_router)
-        async with self.session_maker() as session:
-            session.add_all(asset_routers)
-            await session.commit()
-
-        for i, equity in enumerate(equities):
-            asset_db = EquityModel(
-                sid=asset_routers[i].sid,
-                start_date=equity.start_date,
-                first_traded=equity.first_traded,
-                end_date=equity.end_date,
-                asset_name=equity.asset_name,
-                auto_close_date=equity.auto_close_date,
-                mic=equity.mic
-            )
-            assets_db.append(asset_db)
-            for symbol_mapping in equity.symbol_mapping.values():
-                exchange = await self.get_exchange_by_name(exchange_name=symbol_mapping.exchange_name)
-                if exchange is None:
-                    raise ValueError(f"Exchange {symbol_mapping.exchange_name} not found. Please register it.")
-                equity_symbol_mapping = EquitySymbolMappingModel(
-                    sid=asset_routers[i].sid,
-                    company_symbol=symbol_mapping.company_symbol,
-                    symbol=symbol_mapping.symbol,
-                    share_class_symbol=symbol_mapping.share_class_symbol,
-                    start_date=symbol_mapping.start_date,
-                    end_date=symbol_mapping.end_date,
-                    exchange=exchange.exchange,
-                )
-                symbol_mappings.append(equity_symbol_mapping)
-
-                # trading_pair = TradingPair(
-                #     id=uuid.uuid4(),
-                #     base_asset_sid=asset_router.sid,
-                #     quote_asset_sid=asset_db.sid,
-                #     exchange=asset["exchange"],
-                # )
-                # trading_pairs.append(trading_pair)
+        await self._save_assets(
+            assets=equities, asset_type=AssetType.EQUITY, asset_model=EquityModel,
+            symbol_mapping_model=EquitySymbolMappingModel,
+            get_symbol_mapping_values=lambda symbol_mapping: {
+                "company_symbol": symbol_mapping.company_symbol,
+                "symbol": symbol_mapping.symbol,
+                "share_class_symbol": symbol_mapping.share_class_symbol,
+                "start_date": symbol_mapping.start_date,
+                "end_date": symbol_mapping.end_date,
+            }
+        )
 
-        # do this in one transaction
+    async def _save_assets(self, assets: list[Equity] | list[Currency], asset_type: AssetType,
+                           asset_model: type[BaseModel], symbol_mapping_model: type[BaseModel],
+                           get_symbol_mapping_values: Callable[[Any], dict[str, Any]]) -> None:
+        """Saves assets together with their asset routers and symbol mappings in one transaction.
+
+        Args:
+            assets: Assets to save.
+            asset_type: Type of the assets, stored in the asset router.
+            asset_model: Model of the asset table.
+            symbol_mapping_model: Model of the symbol mapping table of the assets.
+            get_symbol_mapping_values: Returns column values of a symbol mapping, without sid and exchange.
+        """
+        if not assets:
+            return
+        exchanges = await self._get_exchanges_by_names(
+            {symbol_mapping.exchange_name for asset in assets for symbol_mapping in asset.symbol_mapping.values()}
+        )
+        # rows are written with bulk inserts of plain column values in one transaction, building ORM instances for
+        # every row only to have the unit of work flatten them back into columns is skipped; RETURNING with
+        # sort_by_parameter_order gives sids in the order of the inserted assets, also for newly assigned sids
         async with self.session_maker() as session:
-            session.add_all(assets_db)
-            session.add_all(symbol_mappings)
+            sids = (await session.scalars(
+                insert(AssetRouter).returning(AssetRouter.sid, sort_by_parameter_order=True),
+                [{"sid": asset.sid, "asset_type": asset_type.value} for asset in assets]
+            )).all()
+            await session.execute(insert(asset_model), [
+                {
+                    "sid": sid,
+                    "start_date": asset.start_date,
+                    "first_traded": asset.first_traded,
+                    "end_date": asset.end_date,
+                    "asset_name": asset.asset_name,
+                    "auto_close_date": asset.auto_close_date,
+                    "mic": asset.mic,
+                } for sid, asset in zip(sids, assets)
+            ])
+            symbol_mappings = [
+                {
+                    "sid": sid,
+                    "exchange": exchanges[symbol_mapping.exchange_name].exchange,
+                    **get_symbol_mapping_values(symbol_mapping),
+                } for sid, asset in zip(sids, assets) for symbol_mapping in asset.symbol_mapping.values()
+            ]
+            if symbol_mappings:
+                await session.execute(insert(symbol_mapping_model), symbol_mappings)
             await session.commit()
 
     async def save_exchanges(self, exchanges: list[ExchangeInfo]) -> None:
@@ -0,0 +1,5 @@
+import datetime
+
+# lifetime given to ingested assets when the data source does not provide one
+DEFAULT_ASSET_START_DATE = datetime.datetime(year=1900, month=1, day=1, tzinfo=datetime.timezone.utc)
+DEFAULT_ASSET_END_DATE = datetime.datetime(year=2099, month=1, day=1, tzinfo=datetime.timezone.utc)
@@ -0,0 +1,95 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+# Asset and adjustment databases are read far more often than they are written, so give SQLite a larger page cache
+# and a mmap window. Only per-connection settings are changed, journal mode and durability of the database files are
+# left as configured by the user. The page cache is private to each pooled connection, so it is kept at 8 MiB;
+# mmapped pages are shared between connections through the OS page cache.
+SQLITE_PRAGMAS = (
+    "PRAGMA cache_size=-8192",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+# event loop -> database url -> engine and session maker bound to it
+_engines_by_loop: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, tuple[AsyncEngine, async_sessionmaker[AsyncSession]]]
+] = weakref.WeakKeyDictionary()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def get_async_engine(db_url: str) -> AsyncEngine:
+    """
+    Returns async engine for the given database url on the running event loop, creating it on first use.
+
+    Asset and adjustment repositories are usually created for the same database, and can be created multiple times
+    per process. Sharing the engine lets all of them reuse one warm connection pool instead of each opening its own.
+    Pooled connections are bound to the loop they were opened on, so engines are never shared between event loops;
+    engines of a loop are dropped together with the loop and can be closed earlier with `dispose_async_engines`.
+    SQLite connections opened by the engine are tuned with ``SQLITE_PRAGMAS``.
+
+    Args:
+        db_url (str): SQLAlchemy database url.
+
+    Returns:
+        AsyncEngine: Engine shared by all callers using the same database url on the running event loop.
+    """
+    return _get_engine_and_session_maker(db_url=db_url)[0]
+
+
+def get_async_session_maker(db_url: str) -> async_sessionmaker[AsyncSession]:
+    """
+    Returns session maker bound to the engine of `get_async_engine` for the given database url.
+
+    Args:
+        db_url (str): SQLAlchemy database url.
+
+    Returns:
+        async_sessionmaker[AsyncSession]: Session maker shared by all callers using the same database url on the
+        running event loop.
+    """
+    return _get_engine_and_session_maker(db_url=db_url)[1]
+
+
+def _get_engine_and_session_maker(db_url: str) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+    engines = _engines_by_loop.setdefault(asyncio.get_running_loop(), {})
+    engine_and_session_maker = engines.get(db_url)
+    if engine_and_session_maker is None:
+        engine = create_async_engine(db_url, pool_pre_ping=True, pool_size=20)
+        if engine.dialect.name == "sqlite":
+            event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        session_maker = async_sessionmaker(autocommit=False, autoflush=True, bind=engine, class_=AsyncSession,
+                                           expire_on_commit=False)
+        engine_and_session_maker = engines[db_url] = (engine, session_maker)
+    return engine_and_session_maker
+
+
+async def dispose_async_engines():
+    """
+    Closes engines created on the running event loop and their pooled connections.
+
+    Should be called before the event loop is closed, engines are created again on next use.
+    """
+    engines = _engines_by_loop.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(engine.dispose() for engine, _ in engines.values()))
+
+
+@asynccontextmanager
+async def async_engines_scope():
+    """Async context manager disposing engines created on the running event loop on exit."""
+    try:
+        yield
+    finally:
+        await dispose_async_engines()
@@ -17,6 +17,7 @@ from ziplime.assets.repositories.sqlalchemy_adjustments_repository import SqlAlc
 from ziplime.assets.repositories.sqlalchemy_asset_repository import SqlAlchemyAssetRepository
 from ziplime.assets.services.asset_service import AssetService
 from ziplime.constants.period import Period
+from ziplime.constants.asset_dates import DEFAULT_ASSET_END_DATE, DEFAULT_ASSET_START_DATE
 from ziplime.constants.stock_symbols import ALL_US_STOCK_SYMBOLS
 from ziplime.data.data_sources.asset_data_source import AssetDataSource
 from ziplime.data.services.bundle_service import BundleService
@@ -68,13 +69,16 @@ async def ingest_assets(asset_service: AssetService, asset_data_source: AssetDat
     Raises:
         Exception: Propagates any exceptions raised during data fetching or saving processes where applicable.
     """
-    asset_start_date = datetime.datetime(year=1900, month=1, day=1, tzinfo=datetime.timezone.utc)
-    asset_end_date = datetime.datetime(year=2099, month=1, day=1, tzinfo=datetime.timezone.utc)
+    asset_start_date = DEFAULT_ASSET_START_DATE
+    asset_end_date = DEFAULT_ASSET_END_DATE
 
     exchanges = await asset_data_source.get_exchanges()
     if len(exchanges) > 0:
-        await asset_service.save_exchanges(exchanges=exchanges)
-    assets = await asset_data_source.get_assets()
+        # exchanges are written while the asset list is downloaded, the two do not depend on each other
+        _, assets = await asyncio.gather(asset_service.save_exchanges(exchanges=exchanges),
+                                         asset_data_source.get_assets())
+    else:
+        assets = await asset_data_source.get_assets()
 
     currencies = [Currency(
         asset_name="USD",
@@ -118,8 +122,8 @@ async def ingest_default_assets(asset_service: AssetService, asset_data_source:
     Returns:
         None
     """
-    asset_start_date = datetime.datetime(year=1900, month=1, day=1, tzinfo=datetime.timezone.utc)
-    asset_end_date = datetime.datetime(year=2099, month=1, day=1, tzinfo=datetime.timezone.utc)
+    asset_start_date = DEFAULT_ASSET_START_DATE
+    asset_end_date = DEFAULT_ASSET_END_DATE
 
     usd_currency = Currency(
         asset_name="USD",
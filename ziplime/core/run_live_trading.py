@@ -10,6 +10,7 @@ from ziplime.assets.repositories.sqlalchemy_asset_repository import SqlAlchemyAs
 from ziplime.assets.services.asset_service import AssetService
 from ziplime.constants.data_type import DataType
 from ziplime.core.algorithm_file import AlgorithmFile
+from ziplime.core.db.engine import async_engines_scope
 from ziplime.data.services.bundle_service import BundleService
 from ziplime.data.services.file_system_bundle_registry import FileSystemBundleRegistry
 from ziplime.exchanges.lime_trader_sdk.lime_trader_sdk_exchange import LimeTraderSdkExchange
@@ -74,16 +75,18 @@ async def _run_live_trading(
     adjustments_repository = SqlAlchemyAdjustmentRepository(db_url=db_url)
     asset_service = AssetService(asset_repository=assets_repository, adjustments_repository=adjustments_repository)
 
-    return await run_algorithm(
-        algorithm=algo,
-        asset_service=asset_service,
-        print_algo=True,
-        metrics_set=default_metrics(),
-        # benchmark_spec=benchmark_spec,
-        custom_loader=None,
-        exchanges=[exchange],
-        clock=clock,
-    )
+    # database engines are bound to this event loop, close them before asyncio.run closes it
+    async with async_engines_scope():
+        return await run_algorithm(
+            algorithm=algo,
+            asset_service=asset_service,
+            print_algo=True,
+            metrics_set=default_metrics(),
+            # benchmark_spec=benchmark_spec,
+            custom_loader=None,
+            exchanges=[exchange],
+            clock=clock,
+        )
 
 
 def run_live_trading(
@@ -1,4 +1,4 @@
-import datetime
+import asyncio
 import multiprocessing
 import os
 from typing import Self
@@ -12,6 +12,7 @@ from ziplime.assets.entities.asset import Asset
 from ziplime.assets.entities.equity import Equity
 from ziplime.assets.entities.equity_symbol_mapping import EquitySymbolMapping
 from ziplime.assets.models.exchange_info import ExchangeInfo
+from ziplime.constants.asset_dates import DEFAULT_ASSET_END_DATE, DEFAULT_ASSET_START_DATE
 from ziplime.data.data_sources.asset_data_source import AssetDataSource
 
 
@@ -22,26 +23,28 @@ class LimexHubAssetDataSource(AssetDataSource):
         self._logger = structlog.get_logger(__name__)
         self._limex_client = limexhub.RestAPI(token=limex_api_key)
         if maximum_threads is not None:
-            self._maximum_threads = min(multiprocessing.cpu_count() * 2, maximum_threads)
+            self._maximum_threads = min(multiprocessing.cpu_count() * 2, int(maximum_threads))
         else:
             self._maximum_threads = multiprocessing.cpu_count() * 2
 
     async def get_assets(self, **kwargs) -> list[Asset]:
-        assets = self._limex_client.instruments()
+        # the SDK call is blocking, running it on a worker thread keeps the event loop free for other ingestion work
+        assets = await asyncio.to_thread(self._limex_client.instruments)
 
         assets_df = pl.from_dataframe(assets)
         assets_df = assets_df.rename({
             "ticker": "symbol"
         })
-        asset_start_date = datetime.datetime(year=1900, month=1, day=1, tzinfo=datetime.timezone.utc)
-        asset_end_date = datetime.datetime(year=2099, month=1, day=1, tzinfo=datetime.timezone.utc)
+        asset_start_date = DEFAULT_ASSET_START_DATE
+        asset_end_date = DEFAULT_ASSET_END_DATE
 
+        # only the symbol column is needed, iterating named rows would build a dict for every instrument
         equities = [
             Equity(
-                asset_name=asset["symbol"],
+                asset_name=symbol,
                 symbol_mapping={
                     "LIME": EquitySymbolMapping(
-                        symbol=asset["symbol"],
+                        symbol=symbol,
                         exchange_name="LIME",
                         start_date=asset_start_date,
                         end_date=asset_end_date,
@@ -55,7 +58,7 @@ class LimexHubAssetDataSource(AssetDataSource):
                 auto_close_date=asset_end_date,
                 first_traded=asset_start_date,
                 mic="LIME"
-            ) for asset in assets_df.iter_rows(named=True)
+            ) for symbol in assets_df["symbol"].to_list()
         ]
 
         return equities
@@ -74,4 +77,5 @@ class LimexHubAssetDataSource(AssetDataSource):
         maximum_threads = os.environ.get("LIMEX_HUB_MAXIMUM_THREADS", None)
         if limex_hub_key is None:
             raise ValueError("Missing LIMEX_API_KEY environment variable.")
-        return cls(limex_api_key=limex_hub_key, maximum_threads=maximum_threads)
+        return cls(limex_api_key=limex_hub_key,
+                   maximum_threads=int(maximum_threads) if maximum_threads is not None else None)
@@ -1,16 +1,19 @@
+import asyncio
 import datetime
 import multiprocessing
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Self
 
 import limexhub
+import pandas as pd
 import structlog
 from asyncclick import progressbar
-from joblib import Parallel, delayed
 
 import polars as pl
 from ziplime.data.services.data_bundle_source import DataBundleSource
+from ziplime.data.services.limex_hub_client import get_limex_hub_client
 
 fundamental_data_fields = [
 
@@ -51,21 +54,26 @@ def fetch_fundamental_data_task(date_from: datetime.datetime,
                                 date_to: datetime.datetime,
                                 limex_api_key: str,
                                 symbol: str,
-                                ) -> pl.DataFrame:
-    limex_client = limexhub.RestAPI(token=limex_api_key)
-    df = pl.from_pandas(limex_client.fundamental(
+                                ) -> pd.DataFrame:
+    limex_client = get_limex_hub_client(limex_api_key=limex_api_key)
+    return limex_client.fundamental(
         symbol=symbol,
         from_date=(date_from - datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
         to_date=(date_to + datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
         fields=fundamental_data_fields,
-    ), include_index=True)
-    if len(df) > 0:
-        df = df.with_columns(
-            pl.lit(symbol).alias("symbol"),
-            date=pl.col("date").cast(pl.Datetime).dt.replace_time_zone(str(date_from.tzinfo)),
-        ).filter(pl.col("date") >= date_from, pl.col("date") <= date_to)
-        return df
-    return df
+    )
+
+
+def convert_fundamental_data(raw_data: pd.DataFrame,
+                             date_from: datetime.datetime,
+                             date_to: datetime.datetime,
+                             symbol: str,
+                             ) -> pl.LazyFrame:
+    # no rechunk per symbol, the frames are concatenated and rechunked together afterward
+    return pl.from_pandas(raw_data, include_index=True, rechunk=False).lazy().with_columns(
+        pl.lit(symbol).alias("symbol"),
+        date=pl.col("date").cast(pl.Datetime).dt.replace_time_zone(str(date_from.tzinfo)),
+    ).filter(pl.col("date") >= date_from, pl.col("date") <= date_to)
 
 
 class LimexHubFundamentalDataSource(DataBundleSource):
@@ -75,7 +83,7 @@ class LimexHubFundamentalDataSource(DataBundleSource):
         self._logger = structlog.get_logger(__name__)
         self._limex_client = limexhub.RestAPI(token=limex_api_key)
         if maximum_threads is not None:
-            self._maximum_threads = min(multiprocessing.cpu_count() * 2, maximum_threads)
+            self._maximum_threads = min(multiprocessing.cpu_count() * 2, int(maximum_threads))
         else:
             self._maximum_threads = multiprocessing.cpu_count() * 2
 
@@ -86,12 +94,12 @@ class LimexHubFundamentalDataSource(DataBundleSource):
                        **kwargs
                        ) -> pl.DataFrame:
 
-        def fetch_fundamental_data(limex_api_key: str, symbol: str) -> pl.DataFrame | None:
+        def fetch_fundamental_data(limex_api_key: str, symbol: str) -> tuple[str, pd.DataFrame] | None:
             try:
                 result = fetch_fundamental_data_task(date_from=date_from, date_to=date_to,
                                                      limex_api_key=limex_api_key,
                                                      symbol=symbol)
-                return result
+                return symbol, result
             except Exception as e:
                 self._logger.exception(
                     f"Exception fetching historical data for symbol {symbol}, date_from={date_from}, date_to={date_to}. Skipping."
@@ -99,21 +107,31 @@ class LimexHubFundamentalDataSource(DataBundleSource):
                 return None
 
         total_days = (date_to - date_from).days
-        final = pl.DataFrame()
+        loop = asyncio.get_running_loop()
+        # per symbol conversions stay lazy and are evaluated together by a single collect, which polars runs
+        # in parallel outside of the GIL
+        frames = []
 
         with progressbar(length=len(symbols) * total_days, label="Downloading fundamental data from LimexHub",
                          file=sys.stdout) as pbar:
-            res = Parallel(n_jobs=multiprocessing.cpu_count() * 2, prefer="threads",
-                           return_as="generator_unordered")(
-                delayed(fetch_fundamental_data)(self._limex_api_key, symbol) for symbol in symbols)
-            for item in res:
-                pbar.update(total_days)
-                if item is None:
-                    continue
-                if len(item) > 0:
-                    final = pl.concat([final, item])
-
-        return final
+            # worker threads only run the http requests, conversion to polars happens here so the GIL bound
+            # dataframe work does not stall the threads waiting on the network
+            with ThreadPoolExecutor(max_workers=max(1, min(len(symbols), self._maximum_threads))) as executor:
+                futures = [loop.run_in_executor(executor, fetch_fundamental_data, self._limex_api_key, symbol)
+                           for symbol in symbols]
+                for future in asyncio.as_completed(futures):
+                    item = await future
+                    pbar.update(total_days)
+                    if item is None:
+                        continue
+                    symbol, raw_data = item
+                    if len(raw_data) > 0:
+                        frames.append(convert_fundamental_data(raw_data=raw_data, date_from=date_from,
+                                                               date_to=date_to, symbol=symbol))
+
+        if not frames:
+            return pl.DataFrame()
+        return pl.concat(frames, rechunk=True).collect()
 
     @classmethod
     def from_env(cls) -> Self:
@@ -121,4 +139,5 @@ class LimexHubFundamentalDataSource(DataBundleSource):
         maximum_threads = os.environ.get("LIMEX_HUB_MAXIMUM_THREADS", None)
         if limex_hub_key is None:
             raise ValueError("Missing LIMEX_API_KEY environment variable.")
-        return cls(limex_api_key=limex_hub_key, maximum_threads=maximum_threads)
+        return cls(limex_api_key=limex_hub_key,
+                   maximum_threads=int(maximum_threads) if maximum_threads is not None else None)
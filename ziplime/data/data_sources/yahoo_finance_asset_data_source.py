@@ -20,7 +20,7 @@ class YahooFinanceAssetDataSource(AssetDataSource):
         super().__init__()
         self._logger = structlog.get_logger(__name__)
         if maximum_threads is not None:
-            self._maximum_threads = min(multiprocessing.cpu_count() * 2, maximum_threads)
+            self._maximum_threads = min(multiprocessing.cpu_count() * 2, int(maximum_threads))
         else:
             self._maximum_threads = multiprocessing.cpu_count() * 2
 
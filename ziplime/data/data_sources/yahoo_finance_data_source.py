@@ -13,7 +13,7 @@ class YahooFinanceDataSource(DataBundleSource):
         super().__init__()
         self._logger = structlog.get_logger(__name__)
         if maximum_threads is not None:
-            self._maximum_threads = min(multiprocessing.cpu_count() * 2, maximum_threads)
+            self._maximum_threads = min(multiprocessing.cpu_count() * 2, int(maximum_threads))
         else:
             self._maximum_threads = multiprocessing.cpu_count() * 2
 
@@ -51,11 +51,12 @@ class YahooFinanceDataSource(DataBundleSource):
                                         start=date_from, end=date_to, group_by="Ticker", progress=True,
                                         auto_adjust=True,
                                         multi_level_index=False)
-        final = pl.DataFrame()
+        frames = []
         for symbol in symbols:
             df_symbol = yfinance_data_raw[symbol]
 
-            df = pl.from_pandas(df_symbol, include_index=True,
+            # no rechunk per symbol, the frames are concatenated and rechunked together afterward
+            df = pl.from_pandas(df_symbol, include_index=True, rechunk=False,
                                 schema_overrides={"Open": pl.Float64(), "High": pl.Float64(),
                                                   "Low": pl.Float64(), "Close": pl.Float64(),
                                                   "Volume": pl.Float64()}
@@ -87,5 +88,7 @@ class YahooFinanceDataSource(DataBundleSource):
                 else:
                     df = df.with_columns(date=pl.col("date").dt.replace_time_zone(str(date_from.tzinfo)))
                 df = df.filter(pl.col("date") >= date_from, pl.col("date") <= date_to)
-                final = pl.concat([final, df])
-        return final
+                frames.append(df)
+        if not frames:
+            return pl.DataFrame()
+        return pl.concat(frames, rechunk=True)
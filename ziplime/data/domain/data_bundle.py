@@ -1,8 +1,10 @@
 import datetime
+from collections import OrderedDict
 from functools import reduce, lru_cache
 from operator import mul
 from typing import Any
 
+import numpy as np
 import polars as pl
 import structlog
 from exchange_calendars import ExchangeCalendar
@@ -12,11 +14,57 @@ from ziplime.assets.entities.asset import Asset
 from ziplime.assets.entities.equity import Equity
 from ziplime.constants.data_type import DataType
 from ziplime.constants.period import Period
-from ziplime.data.services.data_source import DataSource
+from ziplime.data.services.data_source import (DataSource, sids_series, assets_sids_series, query_columns,
+                                                resample_plan)
 from ziplime.utils.date_utils import period_to_timedelta
 
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_EPOCH_NAIVE = datetime.datetime(1970, 1, 1)
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# windowed query results kept per bundle, strategies often re-request the same window on consecutive bars;
+# cache is bounded by number of results and by their total number of rows, results larger than the row budget
+# are not cached
+QUERY_CACHE_SIZE = 32
+QUERY_CACHE_MAX_ROWS = 1_000_000
+
+
+def _datetime_to_epoch(dt: datetime.datetime, time_unit: str) -> int:
+    """Converts a datetime to the integer representation polars uses for a datetime column with given time unit."""
+    microseconds = (dt - (_EPOCH if dt.tzinfo is not None else _EPOCH_NAIVE)) // _ONE_MICROSECOND
+    if time_unit == "ns":
+        return microseconds * 1000
+    if time_unit == "ms":
+        return microseconds // 1000
+    return microseconds
+
+
+def _build_sid_indexes(data: pl.DataFrame) -> dict[int, tuple[int, int]] | None:
+    """Returns ``(start, end)`` row range of each sid in the data.
+
+    Returns None if rows of some sid are not contiguous or not sorted by date, queries then filter the whole frame.
+    """
+    if "sid" not in data.columns or "date" not in data.columns:
+        return None
+    sid_ranges = data.with_row_index().group_by("sid", maintain_order=True).agg(
+        pl.col("index").first().alias("start_index"),
+        (pl.col("index").last() + 1).alias("end_index"),
+        pl.len().alias("rows"),
+        (pl.col("date") >= pl.col("date").shift(1)).all().alias("date_sorted"),
+    )
+    if not (sid_ranges["end_index"] - sid_ranges["start_index"] == sid_ranges["rows"]).all() or \
+            not sid_ranges["date_sorted"].all():
+        return None
+    # build the mapping from whole columns, iterating named rows boxes every value into a dict first
+    return dict(zip(sid_ranges["sid"].to_list(),
+                    zip(sid_ranges["start_index"].to_list(), sid_ranges["end_index"].to_list())))
+
 
 class DataBundle(DataSource):
+    # bundles are read on every bar of a simulation, slots keep attribute access fast and instances small;
+    # __weakref__ is needed because BundleService keeps loaded bundles in a WeakValueDictionary
+    __slots__ = ("version", "trading_calendar", "timestamp", "_data", "sid_indexes", "_date_index", "_query_cache",
+                 "_query_cache_rows", "query_cache_hits", "query_cache_misses", "_logger", "__weakref__")
 
     def __init__(self, name: str,
                  version: str,
@@ -27,8 +75,7 @@ class DataBundle(DataSource):
                  original_frequency: datetime.timedelta | Period,
                  data_type: DataType,
                  timestamp: datetime.datetime,
-                 data: pl.DataFrame = None,
-                 sid_indexes: dict[int, tuple[int, int]] = None):
+                 data: pl.DataFrame = None):
         super().__init__(name=name,
                          start_date=start_date,
                          end_date=end_date,
@@ -43,13 +90,54 @@ class DataBundle(DataSource):
         self.frequency = frequency
         self.frequency_td = period_to_timedelta(self.frequency)
         self.timestamp = timestamp
-        self.data = data
-        self.sid_indexes = sid_indexes
+        self._query_cache: OrderedDict[tuple, pl.DataFrame] = OrderedDict()
+        self.query_cache_hits = 0
+        self.query_cache_misses = 0
         self._logger = structlog.get_logger(__name__)
+        self.data = data
+
+    @property
+    def data(self) -> pl.DataFrame | None:
+        return self._data
+
+    @data.setter
+    def data(self, data: pl.DataFrame | None) -> None:
+        # everything derived from the data is rebuilt, otherwise queries would keep reading the previous frame
+        self._data = data
+        self.sid_indexes = _build_sid_indexes(data) if data is not None else None
+        self._date_index = None
+        self._query_cache.clear()
+        self._query_cache_rows = 0
 
     def get_dataframe(self) -> pl.DataFrame:
         return self.data
 
+    def _get_date_index(self) -> tuple[str, np.ndarray]:
+        """Returns time unit and raw integer values of the date column, built on first use.
+
+        Data is sorted by sid and date, so together with ``sid_indexes`` this allows binary search of a date
+        inside each sid's slice.
+        """
+        if self._date_index is None:
+            date_column = self.data.get_column("date")
+            self._date_index = (date_column.dtype.time_unit, date_column.to_physical().to_numpy())
+        return self._date_index
+
+    def _get_sid_frames(self, sids: pl.Series) -> list[pl.LazyFrame]:
+        """Returns lazy frames over the rows of each requested sid, in order of ``sids``.
+
+        Rows of a sid are a contiguous zero-copy slice of the data (see ``sid_indexes``), so queries work on the
+        requested sids only instead of running ``is_in`` over the whole frame, and polars can process the slices
+        in parallel when they are concatenated. Sids that are not in the bundle are skipped. Without
+        ``sid_indexes`` the whole frame is filtered instead.
+        """
+        df = self.get_dataframe()
+        if self.sid_indexes is None:
+            return [df.lazy().filter(pl.col("sid").is_in(sids))]
+        sid_frames = [df[sid_index[0]:sid_index[1]].lazy() for sid_index in map(self.sid_indexes.get, sids)
+                      if sid_index is not None]
+        return sid_frames or [df.clear().lazy()]
+
     @lru_cache
     def get_dataframe_with_columns(self, columns: frozenset[str]) -> pl.DataFrame:
         return self.data.select(pl.col(col) for col in columns)
@@ -65,10 +153,14 @@ class DataBundle(DataSource):
                          sids: frozenset[int],
                          include_bounds: bool,
                          ) -> pl.DataFrame:
+        """Returns rows of the given sids between start and end date, resampled to frequency if needed.
 
-        frequency_td = period_to_timedelta(frequency)
-        sids_list = list(sids)
-        asset_sid = sids_list[0]
+        Results are cached per bundle, see ``QUERY_CACHE_SIZE`` and ``QUERY_CACHE_MAX_ROWS``. Every call gets its own
+        frame, so changing a returned frame in place does not affect later calls; ``query_cache_hits`` and
+        ``query_cache_misses`` count cache lookups.
+        """
+        sids = frozenset(sids)
+        sid_series = sids_series(sids)
 
         if end_date > self.end_date:
             raise ValueError(f"Requested end date {end_date} is greater than end date {self.end_date} of the bundle.")
@@ -78,40 +170,39 @@ class DataBundle(DataSource):
         df = self.get_dataframe()
         if fields is None:
             fields = frozenset(df.columns)
-        cols = list(fields.union({"date", "sid"}))
-
-        if include_bounds:
-            if len(sids) == 1:
-                sid_index = self.sid_indexes[asset_sid]
-                df_raw = self.get_dataframe()[sid_index[0]:sid_index[1]].select(pl.col(col) for col in cols).filter(
-                    pl.col("date") >= start_date,
-                    pl.col("date") <= end_date,
-                )
-            else:
-                df_raw = self.get_dataframe().select(pl.col(col) for col in cols).filter(
-                    pl.col("date") >= start_date,
-                    pl.col("date") <= end_date,
-                    pl.col("sid").is_in(sids_list)
-                ).sort(by=["sid", "date"])
-        else:
-            if len(sids) == 1:
-                sid_index = self.sid_indexes[asset_sid]
-                df_raw = self.get_dataframe()[sid_index[0]:sid_index[1]].select(pl.col(col) for col in cols).filter(
-                    pl.col("date") > start_date,
-                    pl.col("date") < end_date,
-                ).sort(by="date")
-
-            else:
-                df_raw = self.get_dataframe().select(pl.col(col) for col in cols).filter(
-                    pl.col("date") > start_date,
-                    pl.col("date") < end_date,
-                    pl.col("sid").is_in(sids_list)).sort(by=["sid", "date"])
-
-        if self.frequency_td < frequency_td:
-            df = df_raw.group_by_dynamic(
-                index_column="date", every=frequency, by="sid").agg(pl.col(field).last() for field in fields)
-            return df
-        return df_raw
+        cols = query_columns(fields)
+
+        cache_key = (sids, fields, start_date, end_date, frequency, include_bounds)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            self._query_cache.move_to_end(cache_key)
+            self.query_cache_hits += 1
+            # clone shares column buffers, but keeps in place changes of a caller (e.g. insert_column) out of the cache
+            return cached.clone()
+        self.query_cache_misses += 1
+
+        # queries are built lazily and collected once, so polars can push the projection and predicates down
+        # sid slices are in date order and sid_series is sorted, so the result is sorted by sid and date
+        date_filter = pl.col("date").is_between(start_date, end_date, closed="both" if include_bounds else "none")
+        lf = pl.concat(
+            sid_frame.select(pl.col(col) for col in cols).filter(date_filter)
+            for sid_frame in self._get_sid_frames(sid_series)
+        )
+
+        needs_resample, _, every = resample_plan(self.frequency_td, frequency)
+        if needs_resample:
+            lf = lf.group_by_dynamic(
+                index_column="date", every=every, group_by="sid"
+            ).agg(pl.col(*fields).last())
+        result = lf.collect()
+
+        if result.height <= QUERY_CACHE_MAX_ROWS:
+            self._query_cache[cache_key] = result
+            self._query_cache_rows += result.height
+            while len(self._query_cache) > QUERY_CACHE_SIZE or self._query_cache_rows > QUERY_CACHE_MAX_ROWS:
+                self._query_cache_rows -= self._query_cache.popitem(last=False)[1].height
+            return result.clone()
+        return result
 
     def get_data_by_date(self, fields: frozenset[str],
                          from_date: datetime.datetime,
@@ -120,40 +211,10 @@ class DataBundle(DataSource):
                          assets: frozenset[Asset],
                          include_bounds: bool,
                          ) -> pl.DataFrame:
-        return self.get_data_by_date_and_sids(fields=fields, from_date=from_date,
-                                              to_date=to_date, frequency=frequency,
-                                              sids=frozenset(asset.sid for asset in assets), include_bounds=include_bounds)
-        cols = set(fields.union({"date", "sid"}))
-        if include_bounds:
-            asset_sid = [asset.sid for asset in assets][0]
-
-            if len(assets) == 1:
-                df = self.get_dataframe_by_sid_and_columns(sid=asset_sid, columns=cols).filter(
-                    pl.col("date") <= to_date,
-                    pl.col("date") >= from_date,
-                )
-            else:
-                df = self.get_dataframe().select(pl.col(col) for col in cols).filter(
-                    pl.col("date") <= to_date,
-                    pl.col("date") >= from_date,
-                    pl.col("sid").is_in([asset.sid for asset in assets])
-                ).group_by(pl.col("sid")).all()
-        else:
-            asset_sid = [asset.sid for asset in assets][0]
-            if len(assets) == 1:
-                df = self.get_dataframe_by_sid_and_columns(sid=asset_sid, columns=cols).filter(
-                    pl.col("date") < to_date,
-                    pl.col("date") > from_date,
-                )
-            else:
-                df = self.get_dataframe().select(pl.col(col) for col in cols).filter(
-                    pl.col("date") < to_date,
-                    pl.col("date") > from_date,
-                    pl.col("sid").is_in([asset.sid for asset in assets])).group_by(pl.col("sid")).all()
-        if self.frequency < frequency:
-            df = df.group_by_dynamic(
-                index_column="date", every=frequency, by="sid").agg(pl.col(field).last() for field in fields)
-        return df.sort(by="date")
+        return self.get_data_by_date_and_sids(fields=fields, start_date=from_date,
+                                              end_date=to_date, frequency=frequency,
+                                              sids=frozenset(asset.sid for asset in assets),
+                                              include_bounds=include_bounds)
 
     def get_missing_data_by_limit(self, fields: frozenset[str],
                                   limit: int,
@@ -176,10 +237,10 @@ class DataBundle(DataSource):
                           assets: frozenset[Asset],
                           include_end_date: bool,
                           ) -> pl.DataFrame:
-        frequency_td = period_to_timedelta(frequency)
-        asset_sid = [asset.sid for asset in assets][0]
+        sid_series = assets_sids_series(assets)
+        needs_resample, multiplier, every = resample_plan(self.frequency_td, frequency)
+        total_bar_count = limit * multiplier if needs_resample else limit
 
-        total_bar_count = limit
         if end_date > self.end_date:
             raise ValueError(f"Requested end date {end_date} is greater than end date {self.end_date} of the bundle.")
             return self.get_missing_data_by_limit(frequency=frequency, assets=assets, fields=fields,
@@ -187,45 +248,22 @@ class DataBundle(DataSource):
                                                   end_date=end_date
                                                   )  # pl.DataFrame() # we have missing data
 
-        if self.frequency_td < frequency_td:
-            multiplier = int(frequency_td / self.frequency_td)
-            total_bar_count = limit * multiplier
         df = self.get_dataframe()
         if fields is None:
             fields = frozenset(df.columns)
-        cols = list(fields.union({"date", "sid"}))
-
-        if include_end_date:
-            if len(assets) == 1:
-                sid_index = self.sid_indexes[asset_sid]
-                df_raw = self.get_dataframe()[sid_index[0]:sid_index[1]].select(pl.col(col) for col in cols).filter(
-                    pl.col("date") <= end_date,
-                ).tail(total_bar_count)
-            else:
-                df_raw = self.get_dataframe().select(pl.col(col) for col in cols).filter(
-                    pl.col("date") <= end_date,
-                    pl.col("sid").is_in([asset.sid for asset in assets])
-                ).group_by(pl.col("sid")).tail(total_bar_count).sort(by="date")
-        else:
-            if len(assets) == 1:
-                sid_index = self.sid_indexes[asset_sid]
-                df_raw = self.get_dataframe()[sid_index[0]:sid_index[1]].select(pl.col(col) for col in cols).filter(
-                    pl.col("date") < end_date,
-                ).tail(
-                    total_bar_count).sort(by="date")
-
-            else:
-                df_raw = self.get_dataframe().select(pl.col(col) for col in cols).filter(
-                    pl.col("date") < end_date,
-                    pl.col("sid").is_in([asset.sid for asset in assets])).group_by(pl.col("sid")).tail(
-                    total_bar_count).sort(by="date")
-
-        if self.frequency_td < frequency_td:
-            df = df_raw.group_by_dynamic(
-                index_column="date", every=frequency, by="sid").agg(pl.col(field).last() for field in fields).tail(
-                limit)
-            return df
-        return df_raw
+        cols = query_columns(fields)
+
+        date_filter = pl.col("date") <= end_date if include_end_date else pl.col("date") < end_date
+        lf = pl.concat(
+            sid_frame.select(pl.col(col) for col in cols).filter(date_filter).tail(total_bar_count)
+            for sid_frame in self._get_sid_frames(sid_series)
+        )
+
+        if needs_resample:
+            lf = lf.group_by_dynamic(
+                index_column="date", every=every, group_by="sid"
+            ).agg(pl.col(*fields).last()).tail(limit)
+        return lf.collect()
 
     def get_spot_value(self, assets: frozenset[Asset], fields: frozenset[str], dt: datetime.datetime,
                        frequency: datetime.timedelta):
@@ -254,16 +292,39 @@ class DataBundle(DataSource):
             ``field`` is 'volume' the value will be a int. If the ``field`` is
             'last_traded' the value will be a Timestamp.
         """
-        # print(f"get spot value: {assets}, {fields}, {dt}")
-        df_raw = self.get_data_by_limit(
-            fields=fields,
-            limit=1,
-            end_date=dt,
-            frequency=frequency,
-            assets=assets,
-            include_end_date=True,
-        )
-        return df_raw
+        if resample_plan(self.frequency_td, frequency)[0]:
+            return self.get_data_by_limit(
+                fields=fields,
+                limit=1,
+                end_date=dt,
+                frequency=frequency,
+                assets=assets,
+                include_end_date=True,
+            )
+        if dt > self.end_date:
+            raise ValueError(f"Requested end date {dt} is greater than end date {self.end_date} of the bundle.")
+
+        if fields is None:
+            fields = frozenset(self.data.columns)
+        cols = query_columns(fields)
+        if self.sid_indexes is None:
+            return self.data.lazy().filter(
+                pl.col("sid").is_in(assets_sids_series(assets)), pl.col("date") <= dt
+            ).sort("sid", "date").group_by("sid", maintain_order=True).last().select(cols).collect()
+
+        # last bar at or before dt is found with a binary search in each sid's slice instead of filtering whole frame
+        time_unit, dates = self._get_date_index()
+        dt_value = _datetime_to_epoch(dt, time_unit)
+        rows = []
+        for sid in assets_sids_series(assets):
+            sid_index = self.sid_indexes.get(sid)
+            if sid_index is None:
+                continue
+            start, end = sid_index
+            row = start + int(np.searchsorted(dates[start:end], dt_value, side="right")) - 1
+            if row >= start:
+                rows.append(row)
+        return self.data.select(pl.col(cols).gather(rows))
 
     async def get_adjusted_value(
             self, asset: Asset, field: str, dt: datetime.datetime, perspective_dt: datetime.datetime,
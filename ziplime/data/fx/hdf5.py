@@ -93,6 +93,7 @@ Each column of the array contains exchange rates for a given date. The label
 for column i in a data node is the ith element of /index/dts.
 """
 
+import datetime
 import h5py
 import logging
 import numpy as np
@@ -277,7 +278,7 @@ class HDF5FXRateWriter:
 
     def _write_metadata(self):
         self._group.attrs["version"] = HDF5_FX_VERSION
-        self._group.attrs["last_updated_utc"] = str(pd.Timestamp.utcnow())
+        self._group.attrs["last_updated_utc"] = str(datetime.datetime.now(datetime.timezone.utc))
 
     def _write_index_group(self, dts, currencies):
         """Write content of /index."""
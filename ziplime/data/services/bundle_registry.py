@@ -1,4 +1,5 @@
 import abc
+import asyncio
 from abc import abstractmethod
 from typing import Any
 
@@ -64,15 +65,33 @@ class BundleRegistry(abc.ABC):
         ...
 
     @abstractmethod
-    async def delete_bundle(self):
+    async def delete_bundle(self, bundle_name: str, bundle_version: str):
         """
         Method for deleting a bundle.
 
+        Args:
+            bundle_name: The name of the bundle to delete.
+            bundle_version: The version of the bundle to delete.
+
         Raises:
             ValueError: If bundle cannot be found
         """
         ...
 
+    async def delete_bundles(self, bundles: list[dict[str, Any]]):
+        """
+        Deletes multiple bundles concurrently.
+
+        Args:
+            bundles: Metadata of the bundles to delete, as returned by `list_bundles`.
+
+        Raises:
+            ValueError: If any of the bundles cannot be found
+        """
+        await asyncio.gather(*(
+            self.delete_bundle(bundle_name=bundle["name"], bundle_version=bundle["version"]) for bundle in bundles
+        ))
+
     @abstractmethod
     async def persist_metadata(self, data_bundle: DataBundle, metadata: dict[str, Any]):
         """
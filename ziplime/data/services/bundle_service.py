@@ -1,5 +1,8 @@
+import asyncio
 import datetime
 import time
+import weakref
+from functools import lru_cache
 from typing import Any
 
 import polars as pl
@@ -17,6 +20,18 @@ from ziplime.utils.class_utils import load_class
 from ziplime.utils.date_utils import period_to_timedelta
 
 
+def _get_bundle_storage_class(bundle_metadata: dict[str, Any]) -> type[BundleStorage]:
+    storage_module_name, _, storage_class_name = bundle_metadata["bundle_storage_class"].rpartition(".")
+    return load_class(module_name=storage_module_name, class_name=storage_class_name)
+
+
+@lru_cache(maxsize=1024)
+def _parse_metadata_datetime(value: str) -> datetime.datetime:
+    # metadata dates are ISO 8601 strings, fromisoformat parses them without going through the strptime machinery;
+    # the same few strings are parsed on every load of a bundle, so results are memoized
+    return datetime.datetime.fromisoformat(value).replace(tzinfo=None)
+
+
 class BundleService:
     """
     Service class responsible for handling operations related to bundles.
@@ -33,6 +48,8 @@ class BundleService:
             bundle_registry (BundleRegistry): Registry for managing bundles.
         """
         self._bundle_registry = bundle_registry
+        # ingested bundles are immutable, so identical load_bundle calls can share the same DataBundle
+        self._loaded_bundles: weakref.WeakValueDictionary[tuple, DataBundle] = weakref.WeakValueDictionary()
         self._logger = structlog.get_logger(__name__)
 
     async def list_bundles(self) -> list[dict[str, Any]]:
@@ -107,16 +124,18 @@ class BundleService:
         """
         self._logger.info(f"Ingesting custom bundle: name={name}, date_start={date_start}, date_end={date_end}, "
                           f"symbols={symbols}, frequency={frequency}")
-        if date_start < trading_calendar.first_session.replace(tzinfo=trading_calendar.tz):
+        first_session = trading_calendar.first_session.replace(tzinfo=trading_calendar.tz)
+        last_session = trading_calendar.last_session.replace(tzinfo=trading_calendar.tz)
+        if date_start < first_session:
             raise ValueError(
                 f"Date start must be after first session of trading calendar. "
-                f"First session is {trading_calendar.first_session.replace(tzinfo=trading_calendar.tz)} "
+                f"First session is {first_session} "
                 f"and date start is {date_start}")
 
-        if date_end > trading_calendar.last_session.replace(tzinfo=trading_calendar.tz):
+        if date_end > last_session:
             raise ValueError(
                 f"Date end must be before last session of trading calendar. "
-                f"Last session is {trading_calendar.last_session.replace(tzinfo=trading_calendar.tz)} "
+                f"Last session is {last_session} "
                 f"and date end is {date_end}")
 
         data = await data_bundle_source.get_data(
@@ -190,13 +209,28 @@ class BundleService:
                                  data_type=DataType.CUSTOM
                                  )
 
-        await self._bundle_registry.register_bundle(data_bundle=data_bundle, bundle_storage=bundle_storage)
-        await bundle_storage.store_bundle(data_bundle=data_bundle)
+        await self._store_and_register_bundle(data_bundle=data_bundle, bundle_storage=bundle_storage)
 
         self._logger.info(f"Finished ingesting custom bundle_name={name}, bundle_version={bundle_version}")
 
         return data_bundle
 
+    async def _store_and_register_bundle(self, data_bundle: DataBundle, bundle_storage: BundleStorage):
+        """Stores bundle data and registers the bundle once the data is written.
+
+        Metadata is prepared while the data is being stored, but it is persisted only after storing succeeded, so the
+        registry never lists a bundle whose data is missing.
+
+        Args:
+            data_bundle (DataBundle): The data bundle to store and register.
+            bundle_storage (BundleStorage): The storage system where the bundle data is saved.
+        """
+        metadata, _ = await asyncio.gather(
+            self._bundle_registry.get_bundle_metadata(data_bundle=data_bundle, bundle_storage=bundle_storage),
+            bundle_storage.store_bundle(data_bundle=data_bundle),
+        )
+        await self._bundle_registry.persist_metadata(data_bundle=data_bundle, metadata=metadata)
+
     async def _backfill_sid_data(self, data: pl.DataFrame, asset_service: AssetService, required_sessions: pl.Series):
         """Backfills missing symbol ID (sid) data in a DataFrame by performing lookups and handling missing
         data sessions. Used when symbols are provided in the input DataFrame but not sids.
@@ -221,30 +255,34 @@ class BundleService:
         unique_symbols = list(data["symbol"].unique())
         symbol_to_sid = {a.get_symbol_by_exchange(exchange_name=None): a.sid for a in
                          await asset_service.get_equities_by_symbols(unique_symbols)}
-        data = data.with_columns(
-            pl.lit(0).alias("sid"),
-        )
 
+        # missing rows of all symbols are concatenated once, concatenating per symbol copies the whole frame each time
+        missing_rows = []
+        # dates of every symbol are gathered in one group by instead of filtering the frame per symbol
+        required_dates = set(required_sessions["date"])
+        symbol_dates = data.group_by("symbol").agg(pl.col("date"))
+        dates_by_symbol = dict(zip(symbol_dates["symbol"].to_list(), symbol_dates["date"].to_list()))
         for symbol in unique_symbols:
-            symbol_data = data.filter(symbol=symbol).with_columns(pl.col("date"))
-            missing_sessions = sorted(set(required_sessions["date"]) - set(symbol_data["date"]))
+            missing_sessions = sorted(required_dates - set(dates_by_symbol.get(symbol, ())))
 
             if len(missing_sessions) > 0:
                 self._logger.warning(
                     f"Data for symbol {symbol} is missing on ticks ({len(missing_sessions)}): {[missing_session.isoformat() for missing_session in missing_sessions]}")
-                new_rows_df = pl.DataFrame(
+                missing_rows.append(pl.DataFrame(
                     {"date": missing_sessions, "symbol": symbol},
                     schema_overrides={"date": data.schema["date"]}
-                )
-                # Concatenate with the original DataFrame
-                data = pl.concat([data, new_rows_df], how="diagonal")
-            missing_symbols = set(unique_symbols) - set(symbol_to_sid)
-            if missing_symbols:
-                raise ValueError(f"Symbols are missing in asset database: {missing_symbols}")
+                ))
+        if missing_rows:
+            # Concatenate with the original DataFrame
+            data = pl.concat([data, *missing_rows], how="diagonal")
 
-            data = data.with_columns(
-                pl.col("symbol").replace(symbol_to_sid).cast(pl.Int64).alias("sid")
-            ).sort(["sid", "date"])
+        missing_symbols = set(unique_symbols) - set(symbol_to_sid)
+        if missing_symbols:
+            raise ValueError(f"Symbols are missing in asset database: {missing_symbols}")
+
+        data = data.with_columns(
+            pl.col("symbol").replace(symbol_to_sid).cast(pl.Int64).alias("sid")
+        ).sort(["sid", "date"])
         return data
 
     async def _backfill_symbol_data(self):
@@ -297,16 +335,18 @@ class BundleService:
         self._logger.info(f"Ingesting market data bundle: name={name}, date_start={date_start}, date_end={date_end}, "
                           f"symbols={symbols}, frequency={frequency}")
         start_duration = time.time()
-        if date_start < trading_calendar.first_session.replace(tzinfo=trading_calendar.tz):
+        first_session = trading_calendar.first_session.replace(tzinfo=trading_calendar.tz)
+        last_session = trading_calendar.last_session.replace(tzinfo=trading_calendar.tz)
+        if date_start < first_session:
             raise ValueError(
                 f"Date start must be after first session of trading calendar. "
-                f"First session is {trading_calendar.first_session.replace(tzinfo=trading_calendar.tz)} "
+                f"First session is {first_session} "
                 f"and date start is {date_start}")
 
-        if date_end > trading_calendar.last_session.replace(tzinfo=trading_calendar.tz):
+        if date_end > last_session:
             raise ValueError(
                 f"Date end must be before last session of trading calendar. "
-                f"Last session is {trading_calendar.last_session.replace(tzinfo=trading_calendar.tz)} "
+                f"Last session is {last_session} "
                 f"and date end is {date_end}")
 
         data = await data_bundle_source.get_data(
@@ -330,7 +370,6 @@ class BundleService:
             raise ValueError(f"Ingested data is missing required columns: {missing}. Cannot ingest bundle.")
 
         data = data.with_columns(
-            pl.lit(0).alias("sid"),
             pl.lit(False).alias("backfilled")
         )
         # repair data
@@ -347,44 +386,53 @@ class BundleService:
         equities_by_exchange = data.select(
             "symbol", "exchange", "exchange_country"
         ).group_by("exchange", "exchange_country").agg(pl.col("symbol").unique())
-        for row in equities_by_exchange.iter_rows(named=True):
-            exchange_name = row["exchange"]
-            exchange_country = row["exchange_country"]
-            symbols = row["symbol"]
+        sid_mappings = []
+        for exchange_name, exchange_country, symbols in zip(equities_by_exchange["exchange"].to_list(),
+                                                            equities_by_exchange["exchange_country"].to_list(),
+                                                            equities_by_exchange["symbol"].to_list()):
             equities = await asset_service.get_equities_by_symbols_and_exchange(symbols=symbols,
                                                                                 exchange_name=exchange_name)
             symbol_to_sid = {e.get_symbol_by_exchange(exchange_name=exchange_name): e.sid for e in equities}
 
+            # missing rows of all symbols are concatenated once, concatenating per symbol copies the whole frame
+            missing_rows = []
+            # dates of every symbol are gathered in one group by instead of filtering the frame per symbol
+            required_dates = set(required_sessions["date"])
+            symbol_dates = data.filter(pl.col("symbol").is_in(symbols)).group_by("symbol").agg(pl.col("date"))
+            dates_by_symbol = dict(zip(symbol_dates["symbol"].to_list(), symbol_dates["date"].to_list()))
             for symbol in symbols:
-                symbol_data = data.filter(symbol=symbol).with_columns(pl.col("date"))
-                missing_sessions = sorted(set(required_sessions["date"]) - set(symbol_data["date"]))
+                missing_sessions = sorted(required_dates - set(dates_by_symbol.get(symbol, ())))
                 if len(missing_sessions) > 0:
                     self._logger.warning(
                         f"Data for symbol {symbol} is missing on ticks ({len(missing_sessions)}): {[missing_session.isoformat() for missing_session in missing_sessions]}")
-                    new_rows_df = pl.DataFrame({"date": missing_sessions, "symbol": symbol, "exchange": exchange_name,
-                                                "exchange_country": exchange_country},
-                                               schema_overrides={"date": data.schema["date"]})
-
-                    # Concatenate with the original DataFrame
-                    data = pl.concat([data, new_rows_df], how="diagonal")
+                    missing_rows.append(pl.DataFrame({"date": missing_sessions, "symbol": symbol,
+                                                      "exchange": exchange_name,
+                                                      "exchange_country": exchange_country},
+                                                     schema_overrides={"date": data.schema["date"]}))
+            if missing_rows:
+                # Concatenate with the original DataFrame
+                data = pl.concat([data, *missing_rows], how="diagonal")
             missing_symbols = set(symbols) - set(symbol_to_sid)
             if missing_symbols:
                 raise ValueError(f"Symbols are missing in asset database: {missing_symbols}")
-
-            data = data.with_columns(
-                pl.when(
-                    pl.col("exchange") == exchange_name
-                ).then(
-                    pl.col("symbol").replace(symbol_to_sid).cast(pl.Int64, strict=False)
-                ).otherwise(
-                    pl.col("sid")
-                )
-                .alias("sid")
-            ).sort(["exchange","sid", "date"])
+            sid_mappings.append(pl.DataFrame({"exchange": exchange_name, "symbol": list(symbol_to_sid),
+                                              "sid": list(symbol_to_sid.values())},
+                                             schema_overrides={"exchange": pl.String, "symbol": pl.String,
+                                                               "sid": pl.Int64}))
+
+        # sids of all exchanges are assigned with one join instead of rewriting the whole frame once per exchange;
+        # the join, sort and forward fills run as one lazy plan, so the frame is materialized only once
+        data_lazy = data.lazy().join(
+            pl.concat(sid_mappings).lazy(), on=["exchange", "symbol"], how="left"
+        ).sort(["exchange", "sid", "date"])
         if forward_fill_missing_ohlcv_data:
-            data = data.with_columns(pl.col("close", "price").fill_null(strategy="forward"))
-            data = data.with_columns(pl.col("high", "low", "open").fill_null(pl.col("price")))
-            data = data.with_columns(pl.col("volume").fill_null(pl.lit(0.0)))
+            data_lazy = data_lazy.with_columns(
+                pl.col("close", "price").fill_null(strategy="forward"),
+                pl.col("volume").fill_null(pl.lit(0.0)),
+            ).with_columns(
+                pl.col("high", "low", "open").fill_null(pl.col("price"))
+            )
+        data = data_lazy.collect()
 
         data_bundle = DataBundle(name=name,
                                  start_date=date_start,
@@ -397,8 +445,7 @@ class BundleService:
                                  version=bundle_version,
                                  data_type=DataType.MARKET_DATA
                                  )
-        await self._bundle_registry.register_bundle(data_bundle=data_bundle, bundle_storage=bundle_storage)
-        await bundle_storage.store_bundle(data_bundle=data_bundle)
+        await self._store_and_register_bundle(data_bundle=data_bundle, bundle_storage=bundle_storage)
         duration = time.time() - start_duration
         self._logger.info(f"Finished ingesting market data bundle_name={name}, bundle_version={bundle_version}."
                           f"Total duration: {duration:.2f} seconds", duration=duration)
@@ -459,6 +506,18 @@ class BundleService:
         """
         self._logger.info(f"Loading bundle: bundle_name={bundle_name}, bundle_version={bundle_version}")
 
+        # custom aggregation expressions are not hashable in a stable way, so such loads are never cached
+        cacheable = aggregations is None
+        load_parameters = (tuple(symbols) if symbols is not None else None, start_date, end_date, frequency,
+                           start_auction_delta, end_auction_delta)
+        if cacheable and bundle_version is not None:
+            # explicit version is already resolved, so a cached bundle can be returned without reading metadata
+            data_bundle = self._loaded_bundles.get((bundle_name, bundle_version, *load_parameters))
+            if data_bundle is not None:
+                self._logger.info(f"Using already loaded bundle: bundle_name={bundle_name}, "
+                                  f"bundle_version={bundle_version}")
+                return data_bundle
+
         bundle_metadata_start = time.time()
 
         bundle_metadata = await self._bundle_registry.load_bundle_metadata(bundle_name=bundle_name,
@@ -469,30 +528,27 @@ class BundleService:
             else:
                 raise ValueError(f"Bundle {bundle_name} with version {bundle_version} not found.")
         self._logger.info(f"Loaded bundle metadata in {time.time() - bundle_metadata_start} seconds")
-        bundle_storage_class: BundleStorage = load_class(
-            module_name='.'.join(bundle_metadata["bundle_storage_class"].split(".")[:-1]),
-            class_name=bundle_metadata["bundle_storage_class"].split(".")[-1])
 
-        bundle_storage = await bundle_storage_class.from_json(bundle_metadata["bundle_storage_data"])
+        cache_key = None
+        if cacheable:
+            cache_key = (bundle_name, bundle_metadata["version"], *load_parameters)
+            data_bundle = self._loaded_bundles.get(cache_key)
+            if data_bundle is not None:
+                self._logger.info(f"Using already loaded bundle: bundle_name={bundle_name}, "
+                                  f"bundle_version={data_bundle.version}")
+                return data_bundle
 
-        bundle_start_date = datetime.datetime.strptime(bundle_metadata["start_date"], "%Y-%m-%dT%H:%M:%SZ")
-        trading_calendar = get_calendar(bundle_metadata["trading_calendar_name"],
-                                        start=bundle_start_date - datetime.timedelta(days=30))
-        bundle_start_date = bundle_start_date.replace(tzinfo=trading_calendar.tz)
-        bundle_end_date = datetime.datetime.strptime(bundle_metadata["end_date"], "%Y-%m-%dT%H:%M:%SZ").replace(
-            tzinfo=trading_calendar.tz)
+        bundle_storage_class = _get_bundle_storage_class(bundle_metadata=bundle_metadata)
+
+        bundle_start_date = _parse_metadata_datetime(bundle_metadata["start_date"])
+        bundle_end_date = _parse_metadata_datetime(bundle_metadata["end_date"])
+        timestamp = _parse_metadata_datetime(bundle_metadata["timestamp"])
         frequency_timedelta = datetime.timedelta(seconds=int(bundle_metadata["frequency_seconds"])) if bundle_metadata[
                                                                                                            "frequency_seconds"] is not None else None
         frequency_text = bundle_metadata.get("frequency_text", None)
-        timestamp = datetime.datetime.strptime(bundle_metadata["timestamp"], "%Y-%m-%dT%H:%M:%SZ").replace(
-            tzinfo=trading_calendar.tz)
         data_type = DataType(bundle_metadata["data_type"])
         bundle_frequency = frequency_timedelta or frequency_text
 
-        if start_date is not None and start_date < bundle_start_date:
-            raise ValueError(f"Start date {start_date} is before bundle start date {bundle_start_date}")
-        if end_date is not None and end_date > bundle_end_date:
-            raise ValueError(f"End date {end_date} is after bundle end date {bundle_end_date}")
         if frequency is not None and period_to_timedelta(frequency) < period_to_timedelta(bundle_frequency):
             raise ValueError(f"Requested frequency {frequency} is less than bundle frequency {bundle_frequency}")
 
@@ -506,6 +562,19 @@ class BundleService:
             raise ValueError(
                 f"Requested end auction delta frequency {frequency} is less than bundle frequency {bundle_frequency}")
 
+        bundle_storage = await bundle_storage_class.from_json(bundle_metadata["bundle_storage_data"])
+        trading_calendar = get_calendar(bundle_metadata["trading_calendar_name"],
+                                        start=bundle_start_date - datetime.timedelta(days=30))
+
+        bundle_start_date = bundle_start_date.replace(tzinfo=trading_calendar.tz)
+        bundle_end_date = bundle_end_date.replace(tzinfo=trading_calendar.tz)
+        timestamp = timestamp.replace(tzinfo=trading_calendar.tz)
+
+        if start_date is not None and start_date < bundle_start_date:
+            raise ValueError(f"Start date {start_date} is before bundle start date {bundle_start_date}")
+        if end_date is not None and end_date > bundle_end_date:
+            raise ValueError(f"End date {end_date} is after bundle end date {bundle_end_date}")
+
         data_bundle = DataBundle(name=bundle_name,
                                  start_date=start_date or bundle_start_date,
                                  end_date=end_date or bundle_end_date,
@@ -529,25 +598,54 @@ class BundleService:
                                                      )
         load_duration = time.time() - bundle_data_load_start
 
-        sid_indexes = data.with_row_index().group_by("sid", maintain_order=True).agg([
-            pl.col("index").first().alias("start_index"),
-            pl.col("index").last().alias("end_index")
-        ])
-
         self._logger.info(f"Loaded data bundle in {load_duration:.2f} seconds",
                           duration=load_duration)
         data_bundle.data = data
-        data_bundle.sid_indexes = {row["sid"]: (row["start_index"], row["end_index"] + 1) for row in
-                                   sid_indexes.iter_rows(named=True)}
+        if cache_key is not None:
+            self._loaded_bundles[cache_key] = data_bundle
         return data_bundle
 
+    async def load_bundles(self, bundle_names: list[str],
+                           start_date: datetime.datetime | None = None,
+                           end_date: datetime.datetime | None = None,
+                           frequency: datetime.timedelta | Period | None = None,
+                           ) -> dict[str, DataBundle]:
+        """
+        Loads the latest version of multiple data bundles concurrently.
+
+        Bundle data is collected on the polars thread pool, so loading e.g. market data and fundamental data bundles
+        together takes roughly as long as loading the largest of them.
+
+        Args:
+            bundle_names (list[str]): Names of the data bundles to load.
+            start_date (datetime.datetime | None): Filter each data bundle to include only data starting with
+                specific date. Defaults to None.
+            end_date (datetime.datetime | None): Filter each data bundle to include only data till specific date.
+                Defaults to None.
+            frequency (datetime.timedelta | Period | None): Desired frequency for data. Defaults to None
+                (frequency in which each bundle was ingested will be used).
+
+        Returns:
+            dict[str, DataBundle]: Loaded data bundles by bundle name.
+
+        Raises:
+            ValueError: If any of the bundles cannot be loaded, see `load_bundle`.
+        """
+        data_bundles = await asyncio.gather(*(
+            self.load_bundle(bundle_name=bundle_name, bundle_version=None, start_date=start_date, end_date=end_date,
+                             frequency=frequency)
+            for bundle_name in bundle_names
+        ))
+        return dict(zip(bundle_names, data_bundles))
+
     async def clean(self, bundle_name: str, before: datetime.datetime = None, after: datetime.datetime = None,
-                    keep_last: bool = None):
+                    keep_last: int = None):
         """
         Cleans up bundles based on the specified criteria.
 
         This method iterates through the bundles in the registry and removes
-        those that match the given parameters.
+        those that match the given parameters. Both the registry metadata and
+        the stored data of each matching version are deleted.
 
         Args:
             bundle_name (str): The name of the bundle to clean.
@@ -555,9 +653,32 @@ class BundleService:
                 this date. Defaults to None.
             after (datetime.datetime, optional): A datetime to filter bundles created after
                 this date. Defaults to None.
-            keep_last (bool, optional): A flag to indicate whether to keep the most recent
-                bundle. Defaults to None.
-        """
+            keep_last (int, optional): Number of the most recent bundles to keep. Defaults to None.
 
-        for bundle in await self._bundle_registry.list_bundles():
-            self._delete_bundle(bundle)
+        Raises:
+            ValueError: If none of `before`, `after` and `keep_last` is given.
+        """
+        if before is None and after is None and keep_last is None:
+            raise ValueError("Cannot clean bundle without before, after or keep_last criteria.")
+        # versions are listed newest first
+        bundles = await self._bundle_registry.list_bundles_by_name(bundle_name=bundle_name)
+        if keep_last is not None:
+            bundles = bundles[keep_last:]
+        if before is not None:
+            before = before.replace(tzinfo=None)
+            bundles = [bundle for bundle in bundles if _parse_metadata_datetime(bundle["timestamp"]) < before]
+        if after is not None:
+            after = after.replace(tzinfo=None)
+            bundles = [bundle for bundle in bundles if _parse_metadata_datetime(bundle["timestamp"]) > after]
+
+        # matching versions are removed with one bulk registry call instead of a round trip per bundle
+        await self._bundle_registry.delete_bundles(bundles=bundles)
+        # metadata is removed first, so a version is never registered without its data
+        await asyncio.gather(*(self._delete_bundle_data(bundle_metadata=bundle) for bundle in bundles))
+        self._logger.info(f"Cleaned {len(bundles)} versions of bundle {bundle_name}")
+
+    async def _delete_bundle_data(self, bundle_metadata: dict[str, Any]):
+        bundle_storage_class = _get_bundle_storage_class(bundle_metadata=bundle_metadata)
+        bundle_storage = await bundle_storage_class.from_json(bundle_metadata["bundle_storage_data"])
+        await bundle_storage.delete_data_bundle(bundle_name=bundle_metadata["name"],
+                                                bundle_version=bundle_metadata["version"])
@@ -73,6 +73,17 @@ class BundleStorage:
         """
         ...
 
+    @abstractmethod
+    async def delete_data_bundle(self, bundle_name: str, bundle_version: str):
+        """
+        Deletes stored data of a data bundle version. Missing data is ignored.
+
+        Args:
+            bundle_name (str): The name of the bundle whose data is deleted.
+            bundle_version (str): The version of the bundle whose data is deleted.
+        """
+        ...
+
     @classmethod
     @abstractmethod
     async def from_json(cls, data: dict[str, Any]) -> Self:
@@ -43,19 +43,14 @@ class CSVDataSource(DataSource):
                          data_type=data_type, original_frequency=frequency)
 
     async def load_data_in_memory(self) -> pl.DataFrame:
-        df = pl.read_csv(self._csv_file_name)  # s, schema_overrides={self._date_column_name: pl.Datetime})
-
-        # Parse "date" column with your format
-        df = df.with_columns(
+        # parsing, renaming and derived columns are fused into one lazy plan and materialized once
+        df = pl.scan_csv(self._csv_file_name).with_columns(
             pl.col(self._date_column_name).str.strptime(pl.Datetime("us"), format=self._date_format).alias(
                 self._date_column_name)
-        )
-
-        df = df.rename(self._column_mapping)
-        df = df.with_columns(
+        ).rename(self._column_mapping).with_columns(
             pl.col("close").alias("price"),
             date=pl.col("date").dt.replace_time_zone(str(self._trading_calendar.tz))
-        )
+        ).collect()
 
         df = await _process_data(data=df,
                            date_start=df["date"].min(),
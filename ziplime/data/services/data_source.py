@@ -1,13 +1,49 @@
 import datetime
+from functools import lru_cache
+
 import polars as pl
 
 from ziplime.assets.entities.asset import Asset
 from ziplime.constants.data_type import DataType
 from ziplime.constants.period import Period
-from ziplime.utils.date_utils import period_to_timedelta
+from ziplime.utils.date_utils import period_to_timedelta, period_to_polars_duration
+
+
+@lru_cache(maxsize=1024)
+def sids_series(sids: frozenset[int]) -> pl.Series:
+    """Returns a cached sid series to use in ``is_in`` filters, so the same universe is not rebuilt on every bar."""
+    return pl.Series("sid", sorted(sids), dtype=pl.Int64)
+
+
+@lru_cache(maxsize=1024)
+def assets_sids_series(assets: frozenset[Asset]) -> pl.Series:
+    """Returns a cached sid series for the given assets."""
+    return sids_series(frozenset(asset.sid for asset in assets))
+
+
+@lru_cache(maxsize=1024)
+def query_columns(fields: frozenset[str]) -> tuple[str, ...]:
+    """Returns columns to select for the given fields in a stable order: sid, date and then fields sorted by name.
+
+    Iterating a frozenset of strings gives a different order in every process, stable order keeps the result column
+    order and polars query plans the same between runs.
+    """
+    return ("sid", "date", *sorted(fields.difference({"sid", "date"})))
+
+
+@lru_cache(maxsize=64)
+def resample_plan(source_frequency: datetime.timedelta,
+                  frequency: datetime.timedelta | Period) -> tuple[bool, int, str]:
+    """Returns how to serve requested frequency from data with source frequency: whether data needs to be resampled,
+    how many source bars make one requested bar and polars duration to use for ``group_by_dynamic``.
+    """
+    frequency_td = period_to_timedelta(frequency)
+    return source_frequency < frequency_td, frequency_td // source_frequency, period_to_polars_duration(frequency)
 
 
 class DataSource:
+    __slots__ = ("name", "start_date", "end_date", "frequency", "frequency_td", "data_type",
+                 "aggregation_specification", "original_frequency")
 
     def __init__(self, name: str, start_date: datetime.date, end_date: datetime.date,
                  frequency: datetime.timedelta | Period,
@@ -54,7 +90,7 @@ class DataSource:
         frequency, and assets. Additionally, it provides an option to include or exclude
         boundary dates in the filtration process. The returned data is grouped by asset
         identifier, and further aggregated based on the provided frequency, if
-        necessary. The resultant data is sorted by the date column.
+        necessary. The resultant data is a flat frame sorted by asset identifier and date.
 
         Arguments:
             fields (frozenset[str]): Set of fields to retrieve from the data.
@@ -67,24 +103,21 @@ class DataSource:
 
         Returns:
             pl.DataFrame: A dataframe containing filtered and aggregated data sorted
-            by date.
+            by sid and date.
         """
-        cols = set(fields.union({"date", "sid"}))
-        if include_bounds:
-            df = self.get_dataframe().select(pl.col(col) for col in cols).filter(
-                pl.col("date") <= to_date,
-                pl.col("date") >= from_date,
-                pl.col("sid").is_in([asset.sid for asset in assets])
-            ).group_by(pl.col("sid")).all()
-        else:
-            df = self.get_dataframe().select(pl.col(col) for col in cols).filter(
-                pl.col("date") < to_date,
-                pl.col("date") > from_date,
-                pl.col("sid").is_in([asset.sid for asset in assets])).group_by(pl.col("sid")).all()
-        if self.frequency < frequency:
-            df = df.group_by_dynamic(
-                index_column="date", every=frequency, by="sid").agg(pl.col(field).last() for field in fields)
-        return df.sort(by="date")
+        cols = query_columns(fields)
+        sid_series = assets_sids_series(assets)
+        # build the whole query lazily so polars can push the projection and predicates down into one scan
+        lf = self.get_dataframe().lazy().select(pl.col(col) for col in cols).filter(
+            pl.col("date").is_between(from_date, to_date, closed="both" if include_bounds else "none"),
+            pl.col("sid").is_in(sid_series)
+        ).sort(by=["sid", "date"])
+        needs_resample, _, every = resample_plan(self.frequency_td, frequency)
+        if needs_resample:
+            lf = lf.group_by_dynamic(
+                index_column="date", every=every, group_by="sid"
+            ).agg(pl.col(*fields).last())
+        return lf.collect()
 
     def get_data_by_limit(self, fields: frozenset[str] | None,
                           limit: int,
@@ -114,39 +147,36 @@ class DataSource:
         Returns:
             pl.DataFrame: The resulting data frame containing the requested data fields and filtered rows.
         """
-        frequency_td = period_to_timedelta(frequency)
-        total_bar_count = limit
+        needs_resample, multiplier, every = resample_plan(self.frequency_td, frequency)
+        total_bar_count = limit * multiplier if needs_resample else limit
         if end_date > self.end_date:
             return self.get_missing_data_by_limit(frequency=frequency, assets=assets, fields=fields,
                                                   limit=limit, include_end_date=include_end_date,
                                                   end_date=end_date
                                                   )  # pl.DataFrame() # we have missing data
 
-        if self.frequency_td < frequency_td:
-            multiplier = int(frequency_td / self.frequency_td)
-            total_bar_count = limit * multiplier
         df = self.get_dataframe()
         if fields is None:
             fields = frozenset(df.columns)
-        cols = list(fields.union({"date", "sid"}))
+        cols = query_columns(fields)
+        sid_series = assets_sids_series(assets)
 
         if include_end_date:
-            df_raw = self.get_dataframe().select(pl.col(col) for col in cols).filter(
+            lf = df.lazy().select(pl.col(col) for col in cols).filter(
                 pl.col("date") <= end_date,
-                pl.col("sid").is_in([asset.sid for asset in assets])
-            ).group_by(pl.col("sid")).tail(total_bar_count).sort(by="date")
+                pl.col("sid").is_in(sid_series)
+            ).group_by(pl.col("sid")).tail(total_bar_count).sort(by=["sid", "date"])
         else:
-            df_raw = self.get_dataframe().select(pl.col(col) for col in cols).filter(
+            lf = df.lazy().select(pl.col(col) for col in cols).filter(
                 pl.col("date") < end_date,
-                pl.col("sid").is_in([asset.sid for asset in assets])).group_by(pl.col("sid")).tail(
-                total_bar_count).sort(by="date")
-
-        if self.frequency_td < frequency_td:
-            df = df_raw.group_by_dynamic(
-                index_column="date", every=frequency, by="sid").agg(pl.col(field).last() for field in fields).tail(
-                limit)
-            return df
-        return df_raw
+                pl.col("sid").is_in(sid_series)).group_by(pl.col("sid")).tail(
+                total_bar_count).sort(by=["sid", "date"])
+
+        if needs_resample:
+            lf = lf.group_by_dynamic(
+                index_column="date", every=every, group_by="sid"
+            ).agg(pl.col(*fields).last()).tail(limit)
+        return lf.collect()
 
     def get_spot_value(self, assets: frozenset[Asset], fields: frozenset[str], dt: datetime.datetime,
                        frequency: datetime.timedelta):
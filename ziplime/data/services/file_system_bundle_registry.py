@@ -1,5 +1,6 @@
 import datetime
 import os
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -11,12 +12,20 @@ from ziplime.data.domain.data_bundle import DataBundle
 from ziplime.data.services.bundle_registry import BundleRegistry
 from ziplime.data.services.bundle_storage import BundleStorage
 
+METADATA_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
 
 class FileSystemBundleRegistry(BundleRegistry):
 
     def __init__(self, base_data_path: str):
         super().__init__()
         self._base_data_path = base_data_path
+        self._bundle_registry_path = Path(self._base_data_path, "bundle_registry")
+        # plain string form of the registry path, used on the lookup paths where all components are known strings
+        # and os.path.join is much cheaper than building pathlib objects
+        self._bundle_registry_dir = os.path.join(self._base_data_path, "bundle_registry")
+        # bundle name -> (registry directory mtime in ns, metadata of all versions of the bundle)
+        self._bundles_by_name_cache: dict[str, tuple[int, list[dict[str, Any]]]] = {}
         self._logger = structlog.get_logger(__name__)
         os.makedirs(self._base_data_path, exist_ok=True)
 
@@ -40,53 +49,90 @@ class FileSystemBundleRegistry(BundleRegistry):
             # "adjustment_repository_class": f"{data_bundle.adjustment_repository.__class__.__module__}.{data_bundle.adjustment_repository.__class__.__name__}",
             # "adjustment_repository_data": data_bundle.adjustment_repository.to_json(),
 
-            "start_date": data_bundle.start_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "end_date": data_bundle.end_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "start_date": data_bundle.start_date.strftime(METADATA_DATETIME_FORMAT),
+            "end_date": data_bundle.end_date.strftime(METADATA_DATETIME_FORMAT),
             "trading_calendar_name": data_bundle.trading_calendar.name,
             "frequency_seconds": frequency_seconds,
             "frequency_text": frequency_text,
-            "timestamp": data_bundle.timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "timestamp": data_bundle.timestamp.strftime(METADATA_DATETIME_FORMAT),
             "data_type": data_bundle.data_type.value,
         }
 
     async def load_bundle_metadata(self, bundle_name: str, bundle_version: str | None) -> dict[str, Any] | None:
         if bundle_version is None:
-            bundles = await self.list_bundles_by_name(bundle_name=bundle_name)
-            if not bundles:
-                return None
-            bundle_version = bundles[0]["version"]
-
-        bundle_metadata_path = Path(self.get_bundle_registry_path(), f"{bundle_name}_{bundle_version}.json")
-        async with aiofiles.open(bundle_metadata_path, mode="rb") as f:
-            return orjson.loads(await f.read())
+            # only the latest version is needed, so take the max instead of sorting all versions;
+            # its metadata was already read while listing
+            return max(await self._list_bundle_versions(bundle_name=bundle_name), key=itemgetter("timestamp"),
+                       default=None)
+
+        bundle_metadata_path = self._get_bundle_metadata_path(bundle_name=bundle_name, bundle_version=bundle_version)
+        try:
+            async with aiofiles.open(bundle_metadata_path, mode="rb") as f:
+                return orjson.loads(await f.read())
+        except FileNotFoundError:
+            return None
 
     def get_bundle_registry_path(self) -> Path:
-        return Path(self._base_data_path, "bundle_registry")
+        return self._bundle_registry_path
+
+    def _get_bundle_metadata_path(self, bundle_name: str, bundle_version: str) -> str:
+        return os.path.join(self._bundle_registry_dir, f"{bundle_name}_{bundle_version}.json")
 
     async def persist_metadata(self, data_bundle: DataBundle, metadata: dict[str, Any]):
-        bundle_metadata_path = Path(self.get_bundle_registry_path(), f"{data_bundle.name}_{data_bundle.version}.json")
-        await aiofiles.os.makedirs(bundle_metadata_path.parent, exist_ok=True)
+        bundle_metadata_path = self._get_bundle_metadata_path(bundle_name=data_bundle.name,
+                                                              bundle_version=data_bundle.version)
+        await aiofiles.os.makedirs(self._bundle_registry_dir, exist_ok=True)
         async with aiofiles.open(bundle_metadata_path, mode="wb") as f:
             await f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+        # rewriting an existing file does not change the directory mtime
+        self._bundles_by_name_cache.pop(data_bundle.name, None)
 
-    async def delete_bundle(self):
-        pass
+    async def delete_bundle(self, bundle_name: str, bundle_version: str):
+        bundle_metadata_path = self._get_bundle_metadata_path(bundle_name=bundle_name, bundle_version=bundle_version)
+        try:
+            await aiofiles.os.remove(bundle_metadata_path)
+        except FileNotFoundError:
+            raise ValueError(f"Bundle {bundle_name} with version {bundle_version} not found.")
+        self._bundles_by_name_cache.pop(bundle_name, None)
 
     async def list_bundles(self) -> list[dict[str, Any]]:
-        registry_items = []
-        for file in await aiofiles.os.scandir(self.get_bundle_registry_path()):
-            if file.is_file():
-                if not file.name.endswith(".json"):
-                    continue
-                registry_items.append(file.path)
+        if not await aiofiles.os.path.isdir(self._bundle_registry_dir):
+            return []
+        return await self._read_metadata_files(file_name_prefix="")
+
+    async def list_bundles_by_name(self, bundle_name: str) -> list[dict[str, Any]]:
+        bundles = await self._list_bundle_versions(bundle_name=bundle_name)
+        if len(bundles) < 2:
+            return list(bundles)
+        return sorted(bundles, key=itemgetter("timestamp"), reverse=True)
+
+    async def _list_bundle_versions(self, bundle_name: str) -> list[dict[str, Any]]:
+        # adding or removing a metadata file bumps the registry directory mtime, which invalidates the cache
+        try:
+            registry_mtime_ns = (await aiofiles.os.stat(self._bundle_registry_dir)).st_mtime_ns
+        except FileNotFoundError:
+            # nothing was registered yet
+            return []
+        cached = self._bundles_by_name_cache.get(bundle_name)
+        if cached is not None and cached[0] == registry_mtime_ns:
+            return cached[1]
+
+        # metadata files are named "<bundle_name>_<bundle_version>.json", so files of other bundles can be skipped
+        # without reading them; the name check below still guards against bundle names sharing a prefix
+        bundles = [b for b in await self._read_metadata_files(file_name_prefix=f"{bundle_name}_")
+                   if b["name"] == bundle_name]
+        self._bundles_by_name_cache[bundle_name] = (registry_mtime_ns, bundles)
+        return bundles
+
+    async def _read_metadata_files(self, file_name_prefix: str) -> list[dict[str, Any]]:
+        with await aiofiles.os.scandir(self._bundle_registry_dir) as entries:
+            # hidden files (editor swap files, partially written copies) are never bundle metadata; the name checks
+            # run before is_file() so most entries are rejected without touching the DirEntry type cache
+            registry_items = [entry.path for entry in entries
+                              if entry.name[:1] != "." and entry.name.startswith(file_name_prefix)
+                              and entry.name.endswith(".json") and entry.is_file()]
         bundles = []
         for item in registry_items:
-            async with aiofiles.open(item, mode="r") as f:
-                bundle_metadata = orjson.loads(await f.read())
-                bundles.append(bundle_metadata)
+            async with aiofiles.open(item, mode="rb") as f:
+                bundles.append(orjson.loads(await f.read()))
         return bundles
-
-    async def list_bundles_by_name(self, bundle_name: str) -> list[dict[str, Any]]:
-        bundles = await self.list_bundles()
-        return sorted(list(filter(lambda b: b["name"] == bundle_name, bundles)), key=lambda b: b["timestamp"],
-                      reverse=True)
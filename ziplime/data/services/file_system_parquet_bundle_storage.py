@@ -1,4 +1,7 @@
+import asyncio
 import datetime
+import os
+import shutil
 
 import aiofiles.os
 from pathlib import Path
@@ -14,6 +17,35 @@ from ziplime.constants.period import Period
 from ziplime.data.domain.data_bundle import DataBundle
 from ziplime.data.services.bundle_storage import BundleStorage
 
+DATA_BUNDLE_FILE_NAME = "data.parquet"
+# bundle data is written here first and renamed to DATA_BUNDLE_FILE_NAME once complete
+TMP_DATA_BUNDLE_FILE_NAME = f".{DATA_BUNDLE_FILE_NAME}.tmp"
+# previous bundle data is moved here while the new data is swapped in, when it can't be replaced in one rename
+OLD_DATA_BUNDLE_FILE_NAME = f".{DATA_BUNDLE_FILE_NAME}.old"
+
+
+def _remove_path(path: Path):
+    """Removes a file or a directory tree, missing path is ignored."""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def _swap_path(source_path: Path, target_path: Path, old_path: Path):
+    """Moves source path to target path, replacing the target whether each of them is a file or a directory."""
+    if source_path.is_file() and not target_path.is_dir():
+        # file over file is replaced atomically
+        os.replace(source_path, target_path)
+        return
+    # a directory (written with partition_by) can't be renamed over a file or a non-empty directory, so the
+    # previous data is moved aside first and removed once the new data is in place
+    _remove_path(old_path)
+    if target_path.exists():
+        os.replace(target_path, old_path)
+    os.replace(source_path, target_path)
+    _remove_path(old_path)
+
 
 class FileSystemParquetBundleStorage(BundleStorage):
 
@@ -34,6 +66,7 @@ class FileSystemParquetBundleStorage(BundleStorage):
                  ) = "auto", ):
         super().__init__()
         self.base_data_path = base_data_path
+        self._data_bundle_root_path = Path(self.base_data_path, "data_bundle")
         self.compression = compression
         self.compression_level = compression_level
         self.statistics = statistics
@@ -50,13 +83,20 @@ class FileSystemParquetBundleStorage(BundleStorage):
         # we need here to know ehere to store bundle, and info is in bundle metadata
         bundle_path = self.get_data_bundle_path(data_bundle=data_bundle)
         await aiofiles.os.makedirs(bundle_path.parent, exist_ok=True)
-        data_bundle.data.write_parquet(bundle_path, compression=self.compression,
+        # write next to the final location and rename, so readers never see a partially written bundle and the
+        # rename stays on the same filesystem
+        tmp_bundle_path = bundle_path.with_name(TMP_DATA_BUNDLE_FILE_NAME)
+        # leftovers of an interrupted write
+        await asyncio.to_thread(_remove_path, tmp_bundle_path)
+        data_bundle.data.write_parquet(tmp_bundle_path, compression=self.compression,
                                        compression_level=10,
                                        statistics=self.statistics, row_group_size=self.row_group_size,
                                        data_page_size=self.data_page_size, use_pyarrow=self.use_pyarrow,
                                        pyarrow_options=self.pyarrow_options, partition_by=self.partition_by,
                                        partition_chunk_size_bytes=self.partition_chunk_size_bytes,
                                        storage_options=self.storage_options)
+        await asyncio.to_thread(_swap_path, tmp_bundle_path, bundle_path,
+                                bundle_path.with_name(OLD_DATA_BUNDLE_FILE_NAME))
 
     async def load_data_bundle(self, data_bundle: DataBundle,
                                symbols: list[str] | None = None,
@@ -127,14 +167,20 @@ class FileSystemParquetBundleStorage(BundleStorage):
                         pl.col(field).last() for field in pl_parquet.collect_schema().names() if
                         field not in ('sid', 'date')
                     )
-        return pl_parquet.sort(["sid", "date"]).collect()
+        # collect on the polars thread pool so loads of several bundles can overlap instead of blocking the event loop;
+        # rechunk once here so every downstream slice/filter works on contiguous buffers
+        return (await pl_parquet.sort(["sid", "date"]).collect_async()).rechunk()
+
+    async def delete_data_bundle(self, bundle_name: str, bundle_version: str):
+        bundle_version_path = self._data_bundle_root_path / bundle_name / bundle_version
+        await asyncio.to_thread(shutil.rmtree, bundle_version_path, ignore_errors=True)
 
     @classmethod
     async def from_json(cls, data: dict[str, Any]) -> Self:
         return cls(base_data_path=data["base_data_path"])
 
     def get_data_bundle_path(self, data_bundle: DataBundle) -> Path:
-        return Path(self.base_data_path, "data_bundle", data_bundle.name, data_bundle.version, f"data.parquet")
+        return self._data_bundle_root_path / data_bundle.name / data_bundle.version / DATA_BUNDLE_FILE_NAME
 
     async def to_json(self, data_bundle: DataBundle) -> dict[str, Any]:
         return {
@@ -15,13 +15,19 @@ from ziplime.data.services.data_bundle_source import DataBundleSource
 
 class LimeTraderSdkDataSource(DataBundleSource):
     def __init__(self, lime_sdk_credentials_file: str | None,
-                 trading_calendar: ExchangeCalendar
+                 trading_calendar: ExchangeCalendar,
+                 lime_sdk_client: AsyncLimeClient | None = None,
+                 lime_sdk_client_sync: LimeClient | None = None,
                  ):
         super().__init__()
         self._lime_sdk_credentials_file = lime_sdk_credentials_file
         self.trading_calendar = trading_calendar
         self._logger = structlog.get_logger(__name__)
-        if lime_sdk_credentials_file is None:
+        if lime_sdk_client is not None and lime_sdk_client_sync is not None:
+            # clients already built by the caller are reused, so credentials are not read and parsed again
+            self._lime_sdk_client = lime_sdk_client
+            self._lime_sdk_client_sync = lime_sdk_client_sync
+        elif lime_sdk_credentials_file is None:
             self._lime_sdk_client = AsyncLimeClient.from_env(logger=self._logger)
             self._lime_sdk_client_sync = LimeClient.from_env(logger=self._logger)
         else:
@@ -70,27 +76,8 @@ class LimeTraderSdkDataSource(DataBundleSource):
             to_date=date_to
         ) for symbol in symbols]
 
-        cols = {"open": [], "close": [], "price": [], "high": [], "low": [], "volume": [], "date": [], "exchange": [],
-                "symbol": [], "exchange_country": []}
-        for results, symbol in zip(results, symbols):
-            for result in results:
-                cols["open"].append(result.open)
-                cols["close"].append(result.close)
-                cols["price"].append(result.close)
-                cols["high"].append(result.high)
-                cols["low"].append(result.low)
-                cols["volume"].append(result.volume)
-                cols["date"].append(result.timestamp.astimezone(date_to.tzinfo))
-                cols["exchange"].append("LIME")
-                cols["exchange_country"].append("US")
-                cols["symbol"].append(symbol)
-        df = pl.DataFrame(cols, schema=[("open", pl.Float64()), ("close", pl.Float64()),
-                                        ("price", pl.Float64()),
-                                        ("high", pl.Float64()), ("low", pl.Float64()),
-                                        ("volume", pl.Float64()),
-                                        ("date", pl.Datetime), ("exchange", pl.String),
-                                        ("exchange_country", pl.String), ("symbol", pl.String)
-                                        ])
+        df = self._quotes_history_to_df(quotes_history=results, symbols=symbols, tz=date_to.tzinfo,
+                                        exchange_name="LIME", exchange_country="US")
         return df.filter(pl.col("date") >= date_from, pl.col("date") <= date_to)
 
     async def get_data(self, symbols: list[str],
@@ -106,25 +93,9 @@ class LimeTraderSdkDataSource(DataBundleSource):
 
         results = await asyncio.gather(*quotes_tasks)
 
-        for result in results:
-            if len(df) > 0:
-                df = df.rename(
-                    {
-                        "o": "open",
-                        "h": "high",
-                        "l": "low",
-                        "c": "close",
-                        "v": "volume",
-                        "Date": "date"
-                    }
-                )
-                df = df.with_columns(
-                    pl.lit(symbol).alias("symbol"),
-                    pl.lit("LIME").alias("exchange"),
-                    pl.lit("US").alias("exchange_country"),
-                    date=pl.col("date").dt.replace_time_zone(str(date_from.tzinfo)),
-                ).filter(pl.col("date") >= date_from, pl.col("date") <= date_to)
-                return df
+        df = self._quotes_history_to_df(quotes_history=results, symbols=symbols, tz=date_to.tzinfo,
+                                        exchange_name="LIME", exchange_country="US")
+        return df.filter(pl.col("date") >= date_from, pl.col("date") <= date_to)
 
     def get_data_by_limit(self, fields: frozenset[str],
                           limit: int,
@@ -166,9 +137,24 @@ class LimeTraderSdkDataSource(DataBundleSource):
             to_date=time_window[-1]
         ) for symbol in symbols]
 
+        df_raw = self._quotes_history_to_df(quotes_history=sdk_results, symbols=symbols, tz=end_date.tzinfo,
+                                            exchange_name=exchange_name, exchange_country=exchange_country)
+        df_raw = df_raw.filter(pl.col("date") >= start_dt, pl.col("date") <= end_dt)
+        if multiplier != 1:
+            df = df_raw.group_by_dynamic(
+                index_column="date", every=frequency, by="sid").agg(pl.col(field).last() for field in fields).tail(
+                limit)
+            return df.select(pl.col(col) for col in fields)
+
+        return df_raw.select(pl.col(col) for col in fields)
+
+    def _quotes_history_to_df(self, quotes_history: list, symbols: list[str], tz: datetime.tzinfo,
+                              exchange_name: str, exchange_country: str) -> pl.DataFrame:
+        # quotes are appended to one list per column and the frame is built once, converting every quote to a
+        # dict first makes polars infer the schema row by row
         cols = {"open": [], "close": [], "price": [], "high": [], "low": [], "volume": [], "date": [], "exchange": [],
                 "symbol": [], "exchange_country": []}
-        for results, symbol in zip(sdk_results, symbols):
+        for results, symbol in zip(quotes_history, symbols):
             for result in results:
                 cols["open"].append(result.open)
                 cols["close"].append(result.close)
@@ -176,25 +162,17 @@ class LimeTraderSdkDataSource(DataBundleSource):
                 cols["high"].append(result.high)
                 cols["low"].append(result.low)
                 cols["volume"].append(result.volume)
-                cols["date"].append(result.timestamp.astimezone(end_date.tzinfo))
-                cols["exchange"].append(exchange_name)
-                cols["exchange_country"].append(exchange_country)
-                cols["symbol"].append(symbol)
-        df_raw = pl.DataFrame(cols, schema=[("open", pl.Float64()), ("close", pl.Float64()),
-                                            ("price", pl.Float64()),
-                                            ("high", pl.Float64()), ("low", pl.Float64()),
-                                            ("volume", pl.Float64()),
-                                            ("date", pl.Datetime), ("exchange", pl.String),
-                                            ("exchange_country", pl.String), ("symbol", pl.String)
-                                            ])
-        df_raw = df_raw.filter(pl.col("date") >= start_dt, pl.col("date") <= end_dt)
-        if multiplier != 1:
-            df = df_raw.group_by_dynamic(
-                index_column="date", every=frequency, by="sid").agg(pl.col(field).last() for field in fields).tail(
-                limit)
-            return df.select(pl.col(col) for col in fields)
-
-        return df_raw.select(pl.col(col) for col in fields)
+                cols["date"].append(result.timestamp.astimezone(tz))
+            cols["exchange"].extend([exchange_name] * len(results))
+            cols["exchange_country"].extend([exchange_country] * len(results))
+            cols["symbol"].extend([symbol] * len(results))
+        return pl.DataFrame(cols, schema=[("open", pl.Float64()), ("close", pl.Float64()),
+                                          ("price", pl.Float64()),
+                                          ("high", pl.Float64()), ("low", pl.Float64()),
+                                          ("volume", pl.Float64()),
+                                          ("date", pl.Datetime), ("exchange", pl.String),
+                                          ("exchange_country", pl.String), ("symbol", pl.String)
+                                          ])
 
     def _frequency_to_period(self, frequency: datetime.timedelta) -> Period:
         match frequency:
@@ -0,0 +1,21 @@
+import threading
+
+import limexhub
+
+_local = threading.local()
+
+
+def get_limex_hub_client(limex_api_key: str) -> limexhub.RestAPI:
+    """Returns LimexHub client for the current thread.
+
+    Data sources download symbols on a thread pool, creating a client per symbol opens a new HTTPS connection
+    every time. Each worker thread keeps one client per api key instead, so connections are reused between
+    requests without sharing a client between threads.
+    """
+    clients = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = {}
+    client = clients.get(limex_api_key)
+    if client is None:
+        client = clients[limex_api_key] = limexhub.RestAPI(token=limex_api_key)
+    return client
@@ -1,16 +1,19 @@
+import asyncio
 import datetime
 import multiprocessing
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Self
 
 import limexhub
+import pandas as pd
 import structlog
 from asyncclick import progressbar
-from joblib import Parallel, delayed
 
 import polars as pl
 from ziplime.data.services.data_bundle_source import DataBundleSource
+from ziplime.data.services.limex_hub_client import get_limex_hub_client
 
 
 def fetch_historical_limex_data_task(date_from: datetime.datetime,
@@ -18,8 +21,8 @@ def fetch_historical_limex_data_task(date_from: datetime.datetime,
                                      limex_api_key: str,
                                      symbol: str,
                                      frequency: datetime.timedelta
-                                     ) -> pl.DataFrame:
-    limex_client = limexhub.RestAPI(token=limex_api_key)
+                                     ) -> pd.DataFrame:
+    limex_client = get_limex_hub_client(limex_api_key=limex_api_key)
     timeframe = 3
     if frequency == datetime.timedelta(minutes=1):
         timeframe = "1m"
@@ -33,28 +36,33 @@ def fetch_historical_limex_data_task(date_from: datetime.datetime,
         timeframe = "1M"
     elif frequency == datetime.timedelta(days=90):
         timeframe = "1q"
-    df = pl.from_pandas(limex_client.candles(symbols=symbol,
-                                             start=(date_from - datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
-                                             end=(date_to + datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
-                                             interval=timeframe), include_index=True,
+    return limex_client.candles(symbols=symbol,
+                                start=(date_from - datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
+                                end=(date_to + datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
+                                interval=timeframe)
+
+
+def convert_historical_limex_data(raw_data: pd.DataFrame,
+                                  date_from: datetime.datetime,
+                                  date_to: datetime.datetime,
+                                  symbol: str,
+                                  ) -> pl.LazyFrame:
+    # no rechunk per symbol, the frames are concatenated and rechunked together afterward
+    df = pl.from_pandas(raw_data, include_index=True, rechunk=False,
                         schema_overrides={"o": pl.Float64(), "h": pl.Float64(), "l": pl.Float64(), "c": pl.Float64(),
                                           "v": pl.Float64()}
                         )
-    if len(df) > 0:
-        df = df.rename(
-            {
-                "Date": "date"
-            }
-        )
-        df = df.with_columns(
-            pl.lit(symbol).alias("symbol"),
-            pl.lit("LIME").alias("exchange"),
-            pl.lit("US").alias("exchange_country"),
-            pl.col("close").alias("price"),
-            date=pl.col("date").dt.replace_time_zone(str(date_from.tzinfo)),
-        ).filter(pl.col("date") >= date_from, pl.col("date") <= date_to)
-        return df
-    return df
+    return df.lazy().rename(
+        {
+            "Date": "date"
+        }
+    ).with_columns(
+        pl.lit(symbol).alias("symbol"),
+        pl.lit("LIME").alias("exchange"),
+        pl.lit("US").alias("exchange_country"),
+        pl.col("close").alias("price"),
+        date=pl.col("date").dt.replace_time_zone(str(date_from.tzinfo)),
+    ).filter(pl.col("date") >= date_from, pl.col("date") <= date_to)
 
 
 class LimexHubDataSource(DataBundleSource):
@@ -64,7 +72,7 @@ class LimexHubDataSource(DataBundleSource):
         self._logger = structlog.get_logger(__name__)
         self._limex_client = limexhub.RestAPI(token=limex_api_key)
         if maximum_threads is not None:
-            self._maximum_threads = min(multiprocessing.cpu_count() * 2, maximum_threads)
+            self._maximum_threads = min(multiprocessing.cpu_count() * 2, int(maximum_threads))
         else:
             self._maximum_threads = multiprocessing.cpu_count() * 2
 
@@ -75,13 +83,13 @@ class LimexHubDataSource(DataBundleSource):
                        **kwargs
                        ) -> pl.DataFrame:
 
-        def fetch_historical(limex_api_key: str, symbol: str) -> pl.DataFrame | None:
+        def fetch_historical(limex_api_key: str, symbol: str) -> tuple[str, pd.DataFrame] | None:
             try:
                 result = fetch_historical_limex_data_task(date_from=date_from, date_to=date_to,
                                                           limex_api_key=limex_api_key,
                                                           symbol=symbol,
                                                           frequency=frequency)
-                return result
+                return symbol, result
             except Exception as e:
                 self._logger.exception(
                     f"Exception fetching historical data for symbol {symbol}, date_from={date_from}, date_to={date_to}. Skipping."
@@ -89,20 +97,31 @@ class LimexHubDataSource(DataBundleSource):
                 return None
 
         total_days = (date_to - date_from).days
-        final = pl.DataFrame()
+        loop = asyncio.get_running_loop()
+        # per symbol conversions stay lazy and are evaluated together by a single collect, which polars runs
+        # in parallel outside of the GIL
+        frames = []
 
         with progressbar(length=len(symbols) * total_days, label="Downloading historical data from LimexHub",
                          file=sys.stdout) as pbar:
-            res = Parallel(n_jobs=multiprocessing.cpu_count() * 2, prefer="threads",
-                           return_as="generator_unordered")(
-                delayed(fetch_historical)(self._limex_api_key, symbol) for symbol in symbols)
-            for item in res:
-                pbar.update(total_days)
-                if item is None:
-                    continue
-                final = pl.concat([final, item])
+            # worker threads only run the http requests, conversion to polars happens here so the GIL bound
+            # dataframe work does not stall the threads waiting on the network
+            with ThreadPoolExecutor(max_workers=max(1, min(len(symbols), self._maximum_threads))) as executor:
+                futures = [loop.run_in_executor(executor, fetch_historical, self._limex_api_key, symbol)
+                           for symbol in symbols]
+                for future in asyncio.as_completed(futures):
+                    item = await future
+                    pbar.update(total_days)
+                    if item is None:
+                        continue
+                    symbol, raw_data = item
+                    if len(raw_data) > 0:
+                        frames.append(convert_historical_limex_data(raw_data=raw_data, date_from=date_from,
+                                                                    date_to=date_to, symbol=symbol))
 
-        return final
+        if not frames:
+            return pl.DataFrame()
+        return pl.concat(frames, rechunk=True).collect()
 
     @classmethod
     def from_env(cls) -> Self:
@@ -110,4 +129,5 @@ class LimexHubDataSource(DataBundleSource):
         maximum_threads = os.environ.get("LIMEX_HUB_MAXIMUM_THREADS", None)
         if limex_hub_key is None:
             raise ValueError("Missing LIMEX_API_KEY environment variable.")
-        return cls(limex_api_key=limex_hub_key, maximum_threads=maximum_threads)
+        return cls(limex_api_key=limex_hub_key,
+                   maximum_threads=int(maximum_threads) if maximum_threads is not None else None)
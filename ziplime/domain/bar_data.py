@@ -3,7 +3,7 @@ from typing import Callable
 
 import pandas as pd
 import polars as pl
-from exchange_calendars import ExchangeCalendar
+from exchange_calendars import ExchangeCalendar, get_calendar, get_calendar_names
 
 from ziplime.assets.domain.continuous_future import ContinuousFuture
 from contextlib import contextmanager
@@ -15,6 +15,9 @@ from ziplime.data.domain.data_bundle import DataBundle
 from ziplime.data.services.data_source import DataSource
 from ziplime.exchanges.exchange import Exchange
 
+# calendar names are fixed once exchange_calendars is imported, get_calendar_names() builds a new list on every call
+_CALENDAR_NAMES = frozenset(get_calendar_names())
+
 
 @contextmanager
 def handle_non_market_minutes(bar_data):
@@ -67,6 +70,10 @@ class BarData:
         self._is_restricted = restrictions.is_restricted
         self.data_sources = data_sources
         self.default_data_source = data_sources[list(data_sources.keys())[0]]
+        # current minute of the last simulation dt it was resolved for, reused by all calls within the same bar
+        self._cached_sim_dt = None
+        self._cached_adjust = None
+        self._cached_current_minute = None
         # first_exchange = exchanges[list(exchanges.keys())[0]]
         # self.default_exchange = first_exchange
 
@@ -82,6 +89,9 @@ class BarData:
         - if we're in daily mode, get the session label for this minute.
         """
         dt = self.simulation_dt_func()
+        if dt == self._cached_sim_dt and self._adjust_minutes == self._cached_adjust:
+            return self._cached_current_minute
+        sim_dt = dt
 
         if self._adjust_minutes:
             dt = self._trading_calendar.previous_minute(dt)
@@ -94,6 +104,9 @@ class BarData:
         #     dt = self.data_portal.trading_calendar.minute_to_session(dt)
 
         # return dt
+        self._cached_sim_dt = sim_dt
+        self._cached_adjust = self._adjust_minutes
+        self._cached_current_minute = dt
         return dt
 
     def current(self, assets: list[Asset], fields: list[str],
@@ -162,21 +175,26 @@ class BarData:
         fields = frozenset(fields)
         if data_source is None:
             data_source = self.default_data_source.name
+        source = self.data_sources[data_source]
+        # current minute is resolved once per call, not once per requested value
+        dt = self._get_current_minute()
         if not self._adjust_minutes:
-            return self.data_sources[data_source].current(
+            # all fields of all assets are fetched from the source in a single call
+            return source.current(
                 assets=assets,
                 fields=fields,
-                dt=self._get_current_minute(),
+                dt=dt,
             )
         else:
+            perspective_dt = self.simulation_dt_func()
             for field in fields:
                 series = pd.Series(data={
-                    asset: self.data_sources[data_source].get_adjusted_value(
+                    asset: source.get_adjusted_value(
                         asset,
                         field,
-                        self._get_current_minute(),
-                        self.simulation_dt_func(),
-                        self.data_bundle.frequency
+                        dt,
+                        perspective_dt,
+                        source.frequency
                     )
                     for asset in assets
                 }, index=assets, name=field)
@@ -226,59 +244,54 @@ class BarData:
             can be traded in the current minute.
         """
         dt = self.simulation_dt_func()
-        assets = set(assets)
+        assets = list(frozenset(assets))
         if self._adjust_minutes:
             adjusted_dt = self._get_current_minute()
         else:
             adjusted_dt = dt
 
-        # if isinstance(assets, Asset):
-        #     return self._can_trade_for_asset(
-        #         assets, dt, adjusted_dt, data_portal
-        #     )
-        # else:
-        tradeable = [
-            self._can_trade_for_asset(
-                asset=asset, dt=dt, adjusted_dt=adjusted_dt
-            )
-            for asset in assets
-        ]
-        return pd.Series(data=tradeable, index=assets, dtype=bool)
-
-    def _can_trade_for_asset(self, asset: Asset, dt: datetime.datetime, adjusted_dt: datetime.datetime) -> bool:
-        session_label = None
-        dt_to_use_for_exchange_check = None
-
-        if self._is_restricted(assets=frozenset({asset}), dt=adjusted_dt):
-            return False
+        if not assets:
+            return pd.Series(data=[], index=assets, dtype=bool)
 
-        session_label = self._trading_calendar.minute_to_session(minute=dt)
+        # every check is evaluated once for all assets, not one restriction/calendar/price lookup per asset
+        restricted_mask = self._is_restricted(assets=assets, dt=adjusted_dt).to_numpy(dtype=bool)
 
-        if not asset.is_alive_for_session(session_label=session_label):
-            # asset isn't alive
-            return False
-
-        if asset.auto_close_date and session_label > asset.auto_close_date:
-            return False
+        session = self._trading_calendar.minute_to_session(minute=dt)
+        session_label = session.date()
+        alive_mask = np.array([
+            asset.is_alive_for_session(session_label=session) if isinstance(asset, ContinuousFuture) else
+            (asset.start_date is None or asset.start_date <= session_label) and
+            (asset.end_date is None or session_label <= asset.end_date) and
+            (asset.auto_close_date is None or session_label <= asset.auto_close_date)
+            for asset in assets
+        ], dtype=bool)
 
-        # TODO: check this
-        _daily_mode = False
-        if not _daily_mode:
-            # Find the next market minute for this calendar, and check if this
-            # asset's exchange is open at that minute.
-            if self._trading_calendar.is_open_on_minute(minute=dt):
-                dt_to_use_for_exchange_check = dt
+        # Find the next market minute for this calendar, and check if each asset's exchange is open at that minute.
+        # Calendars are checked once per exchange.
+        if self._trading_calendar.is_open_on_minute(minute=dt):
+            dt_to_use_for_exchange_check = dt
+        else:
+            dt_to_use_for_exchange_check = self._trading_calendar.next_open(minute=dt)
+        # Assets without a MIC or with a MIC exchange_calendars doesn't know (e.g. "LIME" for assets ingested from
+        # LimexHub) trade on the simulation calendar, which is open at the minute being checked.
+        asset_mics = [asset.exchange if isinstance(asset, ContinuousFuture) else asset.mic for asset in assets]
+        exchange_open = {}
+        for mic in set(asset_mics):
+            if mic is None or mic == self._trading_calendar.name or mic not in _CALENDAR_NAMES:
+                exchange_open[mic] = True
             else:
-                dt_to_use_for_exchange_check = self._trading_calendar.next_open(minute=dt)
+                exchange_open[mic] = get_calendar(mic).is_open_on_minute(minute=dt_to_use_for_exchange_check)
+        exchange_mask = np.array([exchange_open[mic] for mic in asset_mics], dtype=bool)
 
-            if not asset.is_exchange_open(dt_minute=dt_to_use_for_exchange_check):
-                return False
         # is there a last price?
-        return not np.isnan(
-            self.data_portal.get_spot_value(
-                assets=frozenset({asset}), field="price", dt=adjusted_dt, data_frequency=self.data_frequency
-            )
-        )
+        source = self.default_data_source
+        prices = source.get_spot_value(assets=frozenset(assets), fields=frozenset({"price"}), dt=adjusted_dt,
+                                       frequency=source.frequency)
+        priced_sids = prices.filter(pl.col("price").is_not_null() & pl.col("price").is_not_nan())["sid"].to_numpy()
+        price_mask = np.isin(np.fromiter((asset.sid for asset in assets), dtype=np.int64, count=len(assets)),
+                             priced_sids)
+
+        return pd.Series(data=~restricted_mask & alive_mask & exchange_mask & price_mask, index=assets, dtype=bool)
 
     def history(self, assets: list[Asset], bar_count: int,
                 frequency: datetime.timedelta | Period = datetime.timedelta(days=1),
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class ColumnSpecification:
     """Describes how historical data value is stored"""
     name: str
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from ziplime.assets.entities.asset import Asset
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     asset: Asset
     amount: int
@@ -71,7 +71,9 @@ class LimeTraderSdkExchange(Exchange):
         self._tracked_orders = {}
         self.processed_transaction_ids = set()
         self._lime_trader_sdk_data_source = LimeTraderSdkDataSource(lime_sdk_credentials_file=lime_sdk_credentials_file,
-                                                                    trading_calendar=trading_calendar)
+                                                                    trading_calendar=trading_calendar,
+                                                                    lime_sdk_client=self._lime_sdk_client,
+                                                                    lime_sdk_client_sync=self._sync_lime_sdk_client)
         self.cash_balance = cash_balance
 
     def get_start_cash_balance(self) -> float:
@@ -216,13 +216,11 @@ class SimulationExchange(Exchange):
         #     frequency=self.data_source.frequency
         # )
 
-        return self.get_data_by_limit(
-            fields=fields,
-            limit=1,
-            end_date=dt,
-            frequency=self.data_source.frequency,
+        return self.data_source.get_spot_value(
             assets=assets,
-            include_end_date=True,
+            fields=fields,
+            dt=dt,
+            frequency=self.data_source.frequency
         )
         # return df_raw
 
@@ -21,7 +21,7 @@ import datetime
 from ziplime.assets.entities.asset import Asset
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Position:
     asset: Asset
     amount: int
@@ -172,42 +172,38 @@ def calculate_position_tracker_stats(positions, stats):
             index=index,
         )
 
-    ix = 0
-
-    for outer_position in positions.values():
-        position = outer_position
-
-        # NOTE: this loop does a lot of stuff!
-        # we call this function every time the portfolio value is needed,
-        # which is at least once per simulation day, so let's not iterate
-        # through every single position multiple times.
-        # try:
-        exposure = position.amount * position.last_sale_price
-        # except Exception as e:
-        #     print("exception multiplying a")
-        #     raise
-        if type(position.asset) is FuturesContract:
-            # Futures don't have an inherent position value.
-            value = 0
-
-            # unchecked cast, this is safe because we do a type check above
-            exposure *= position.asset.price_multiplier
+    # NOTE: this is called every time the portfolio value is needed, which is at least once per simulation day.
+    # Position fields are gathered into columns in a single pass and all stats are computed with array operations
+    # instead of accumulating scalars position by position.
+    if npos:
+        position_list = list(positions.values())
+        amounts = np.fromiter((position.amount for position in position_list), dtype='float64', count=npos)
+        last_sale_prices = np.fromiter((position.last_sale_price for position in position_list), dtype='float64',
+                                       count=npos)
+        is_future = np.fromiter((type(position.asset) is FuturesContract for position in position_list), dtype=bool,
+                                count=npos)
+        index[:] = np.fromiter((position.asset.sid for position in position_list), dtype='int64', count=npos)
+
+        np.multiply(amounts, last_sale_prices, out=position_exposure)
+        if is_future.any():
+            # Futures don't have an inherent position value, their exposure is scaled by the contract multiplier.
+            position_exposure[is_future] *= np.fromiter(
+                (position.asset.price_multiplier for position, future in zip(position_list, is_future) if future),
+                dtype='float64'
+            )
+            position_value = np.where(is_future, 0.0, position_exposure)
         else:
-            value = exposure
+            position_value = position_exposure
 
-        if exposure > 0:
-            longs_count += 1
-            long_value += value
-            long_exposure += exposure
-        elif exposure < 0:
-            shorts_count += 1
-            short_value += value
-            short_exposure += exposure
+        long_mask = position_exposure > 0
+        short_mask = position_exposure < 0
 
-        index[ix] = position.asset.sid
-        position_exposure[ix] = exposure
-
-        ix += 1
+        longs_count = int(np.count_nonzero(long_mask))
+        shorts_count = int(np.count_nonzero(short_mask))
+        long_value = float(position_value[long_mask].sum())
+        short_value = float(position_value[short_mask].sum())
+        long_exposure = float(position_exposure[long_mask].sum())
+        short_exposure = float(position_exposure[short_mask].sum())
 
     net_value = long_value + short_value
     gross_value = long_value - short_value
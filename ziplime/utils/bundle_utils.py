@@ -3,9 +3,6 @@ from pathlib import Path
 
 from ziplime.data.services.bundle_service import BundleService
 from ziplime.data.services.file_system_bundle_registry import FileSystemBundleRegistry
-from ziplime.data.services.lime_trader_sdk_data_source import LimeTraderSdkDataSource
-from ziplime.exchanges.lime_trader_sdk.lime_trader_sdk_exchange import LimeTraderSdkExchange
-from ziplime.data.data_sources.limex_hub_fundamental_data_source import LimexHubFundamentalDataSource
 
 
 def get_data_source(code: str):
@@ -13,6 +10,8 @@ def get_data_source(code: str):
         lime_trader_sdk_credentials = os.environ.get("LIME_SDK_CREDENTIALS_FILE", None)
         if lime_trader_sdk_credentials is None:
             raise ValueError("Missing LIME_SDK_CREDENTIALS_FILE environment variable.")
+        # provider SDKs are imported only when requested, so loading bundles does not pay for importing them
+        from ziplime.data.services.lime_trader_sdk_data_source import LimeTraderSdkDataSource
         return LimeTraderSdkDataSource(lime_sdk_credentials_file=lime_trader_sdk_credentials)
     raise Exception("Unsupported live market data provider!")
 
@@ -22,6 +21,7 @@ def get_fundamental_data_provider(code: str):
         maximum_threads = os.environ.get("LIMEX_HUB_MAXIMUM_THREADS", None)
         if limex_hub_key is None:
             raise ValueError("Missing LIMEX_API_KEY environment variable.")
+        from ziplime.data.data_sources.limex_hub_fundamental_data_source import LimexHubFundamentalDataSource
         return LimexHubFundamentalDataSource(limex_api_key=limex_hub_key, maximum_threads=maximum_threads)
     raise Exception("Unsupported fundamental data provider!")
 
@@ -30,6 +30,7 @@ def get_exchange(code: str):
         lime_trader_sdk_credentials = os.environ.get("LIME_SDK_CREDENTIALS_FILE", None)
         if lime_trader_sdk_credentials is None:
             raise ValueError("Missing LIME_SDK_CREDENTIALS_FILE environment variable.")
+        from ziplime.exchanges.lime_trader_sdk.lime_trader_sdk_exchange import LimeTraderSdkExchange
         return LimeTraderSdkExchange(lime_sdk_credentials_file=lime_trader_sdk_credentials)
     raise Exception("Unsupported live market data provider!")
 
@@ -1,7 +1,10 @@
 import importlib
+from functools import lru_cache
 
 
+@lru_cache(maxsize=256)
 def load_class(module_name: str, class_name: str):
+    # classes are resolved from bundle metadata on every bundle load, repeated lookups skip the import machinery
     # Import the module
     module = importlib.import_module(module_name)
     # Get the class from the module
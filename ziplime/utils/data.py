@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Any
 
 import pandas as pd
@@ -6,6 +7,12 @@ from ziplime.trading.trading_algorithm import TradingAlgorithm
 from ziplime.domain.bar_data import BarData
 
 
+@lru_cache(maxsize=256)
+def _date_range(start: pd.Timestamp, end: pd.Timestamp, freq: str) -> pd.DatetimeIndex:
+    # DatetimeIndex is immutable, so the same range can be shared between calls for different assets and fields
+    return pd.date_range(start=start, end=end, freq=freq)
+
+
 def get_fundamental_data(
         bar_data: BarData,
         context: TradingAlgorithm,
@@ -29,7 +36,7 @@ def get_fundamental_data(
     if start_date < first_date:
         start_date_array = first_date
 
-    dr = pd.date_range(start_date_array, bar_data.current_session, freq='D')
+    dr = _date_range(start_date_array, bar_data.current_session, 'D')
 
     res = fundamental_data_bundle.load_raw_arrays_full_range(
         [fields],
@@ -40,7 +47,7 @@ def get_fundamental_data(
     )[0]
 
     df = pd.DataFrame(data=res, index=dr)
-    quarters = pd.date_range(start=start_date, end=end_date, freq='QE')
+    quarters = _date_range(start_date, end_date, 'QE')
     df = df.reindex(quarters)
     if fillna is not None:
         df[df.isnull()] = fillna
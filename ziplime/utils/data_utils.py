@@ -88,27 +88,30 @@ async def _backfill_sid_data(data: pl.DataFrame, asset_service: AssetService, re
     unique_symbols = list(data["symbol"].unique())
     symbol_to_sid = {a.get_symbol_by_exchange(exchange_name=None): a.sid for a in
                      await asset_service.get_equities_by_symbols(unique_symbols)}
-    data = data.with_columns(
-        pl.lit(0).alias("sid"),
-    )
 
+    # missing rows of all symbols are concatenated once, concatenating per symbol copies the whole frame each time
+    missing_rows = []
+    # dates of every symbol are gathered in one group by instead of filtering the frame per symbol
+    required_dates = set(required_sessions["date"])
+    symbol_dates = data.group_by("symbol").agg(pl.col("date"))
+    dates_by_symbol = dict(zip(symbol_dates["symbol"].to_list(), symbol_dates["date"].to_list()))
     for symbol in unique_symbols:
-        symbol_data = data.filter(symbol=symbol).with_columns(pl.col("date"))
-        missing_sessions = sorted(set(required_sessions["date"]) - set(symbol_data["date"]))
+        missing_sessions = sorted(required_dates - set(dates_by_symbol.get(symbol, ())))
 
         if len(missing_sessions) > 0:
             _logger.warning(
                 f"Data for symbol {symbol} is missing on ticks ({len(missing_sessions)}): {[missing_session.isoformat() for missing_session in missing_sessions]}")
-            new_rows_df = pl.DataFrame(
+            missing_rows.append(pl.DataFrame(
                 {"date": missing_sessions, "symbol": symbol},
                 schema_overrides={"date": data.schema["date"]}
-            )
-            # Concatenate with the original DataFrame
-            data = pl.concat([data, new_rows_df], how="diagonal")
+            ))
+    if missing_rows:
+        # Concatenate with the original DataFrame
+        data = pl.concat([data, *missing_rows], how="diagonal")
 
-        data = data.with_columns(
-            pl.col("symbol").replace(symbol_to_sid).cast(pl.Int64).alias("sid")
-        ).sort(["sid", "date"])
+    data = data.with_columns(
+        pl.col("symbol").replace(symbol_to_sid).cast(pl.Int64).alias("sid")
+    ).sort(["sid", "date"])
     return data
 
 
@@ -1,6 +1,6 @@
 import datetime
-
-from toolz import partition_all
+from functools import lru_cache
+from itertools import batched
 
 from ziplime.constants.period import Period
 
@@ -43,7 +43,7 @@ def compute_date_range_chunks(sessions, start_date, end_date, chunksize):
         return [(start_date, end_date)]
 
     start_ix, end_ix = sessions.slice_locs(start_date, end_date)
-    return ((r[0], r[-1]) for r in partition_all(chunksize, sessions[start_ix:end_ix]))
+    return ((r[0], r[-1]) for r in batched(sessions[start_ix:end_ix], chunksize))
 
 
 def make_utc_aware(dti):
@@ -85,3 +85,18 @@ def period_to_timedelta(period: Period | datetime.timedelta) -> datetime.timedel
         return datetime.timedelta(days=365)
 
     raise ValueError(f"Invalid period: {period}")
+
+
+@lru_cache(maxsize=64)
+def period_to_polars_duration(period: Period | datetime.timedelta) -> str:
+    """Converts period to polars duration string (e.g. "5m", "1d12h") used as ``every`` in ``group_by_dynamic``."""
+    if type(period) is not datetime.timedelta:
+        return period
+    parts = []
+    if period.days:
+        parts.append(f"{period.days}d")
+    if period.seconds:
+        parts.append(f"{period.seconds}s")
+    if period.microseconds:
+        parts.append(f"{period.microseconds}us")
+    return "".join(parts) or "0us"